@@ -0,0 +1,212 @@
+"""
+Headless benchmark suite of all live plot types.
+
+Plots are rendered by Qt offscreen platform plugin, so benchmark runs without display.
+For every plot type, point count and connector count benchmark measures:
+- sustained ingestion throughput in samples per second
+- frames per second, where one frame is data append into all connectors followed by synchronous repaint
+- per-frame latency from data append until repaint is finished
+- peak memory allocated during a few frames, measured by tracemalloc
+
+Results are printed or written as JSON, so they can be compared between releases.
+Numeric plots can be fed by y values of a StreamRecorder recording instead of a sine wave, using --recording.
+
+Run with: python -m benchmarks.live_plots --points 1000 100000 --connectors 1 10 --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+import pyqtgraph as pg  # type: ignore # noqa: E402
+from pyqtgraph.Qt import QtWidgets  # type: ignore # noqa: E402
+
+from pglive.sources.data_connector import DataConnector  # noqa: E402
+from pglive.sources.live_HeatMap import LiveHeatMap  # noqa: E402
+from pglive.sources.live_candleStickPlot import LiveCandleStickPlot  # noqa: E402
+from pglive.sources.live_categorized_bar_plot import LiveCategorizedBarPlot  # noqa: E402
+from pglive.sources.live_plot import LiveLinePlot, LiveScatterPlot, LiveVBarPlot, LiveHBarPlot  # noqa: E402
+from pglive.sources.live_plot_widget import LivePlotWidget  # noqa: E402
+from pglive.sources.recorder import StreamReplay  # noqa: E402
+
+CATEGORIES = ["A", "B", "C", "D", "E"]
+
+
+def numeric_data(start: int, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    x = np.arange(start, start + count)
+    return np.sin(x * 0.01), x
+
+
+def recorded_data(path: str) -> Callable[[int, int], Tuple[np.ndarray, np.ndarray]]:
+    """Numeric data generator repeating all recorded y values, x is sample index"""
+    y = np.concatenate([np.ravel(np.asarray(y, dtype=np.float64)) for _, _, y, _, _ in StreamReplay(path)])
+
+    def generator(start: int, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        x = np.arange(start, start + count)
+        return y[x % y.size], x
+
+    return generator
+
+
+def candle_data(start: int, count: int) -> Tuple[List[Tuple[float, ...]], List[int]]:
+    x = np.arange(start, start + count)
+    a, b = np.sin(x * 0.025), np.sin(x * 0.020)
+    low, high = np.minimum(a, b) - 0.5, np.maximum(a, b) + 0.5
+    return list(zip(a.tolist(), b.tolist(), low.tolist(), high.tolist())), x.tolist()
+
+
+def category_data(start: int, count: int) -> Tuple[List[List[str]], List[int]]:
+    x = list(range(start, start + count))
+    return [CATEGORIES[:1 + i % len(CATEGORIES)] for i in x], x
+
+
+# Plot factory, data generator and maximum sensible number of points for every plot type
+PLOT_TYPES: Dict[str, Tuple[Callable, Callable, float]] = {
+    "line": (lambda: LiveLinePlot(pen="green"), numeric_data, 1e6),
+    "scatter": (lambda: LiveScatterPlot(brush="green", size=3), numeric_data, 1e5),
+    "vbar": (lambda: LiveVBarPlot(brush="green", pen="green"), numeric_data, 1e5),
+    "hbar": (lambda: LiveHBarPlot(brush="green", pen="green"), numeric_data, 1e5),
+    "candlestick": (LiveCandleStickPlot, candle_data, 1e5),
+    "categorized_bar": (lambda: LiveCategorizedBarPlot(CATEGORIES), category_data, 1e5),
+    "heatmap": (lambda: LiveHeatMap(colormap=pg.colormap.get("plasma")), None, 1e4),
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.
+
+
+class PlotBenchmark:
+    """Benchmark of one plot type with given number of points and connectors"""
+
+    def __init__(self, app: QtWidgets.QApplication, plot_type: str, points: int, connectors: int,
+                 chunk: int, ring_buffer: bool, numeric_generator: Optional[Callable] = None) -> None:
+        self.app = app
+        self.plot_type = plot_type
+        self.points = points
+        self.chunk = chunk
+        factory, self.generator, _ = PLOT_TYPES[plot_type]
+        self.widget = LivePlotWidget(title=f"{plot_type} benchmark")
+        self.widget.resize(1200, 600)
+        self.widget.show()
+        self.connectors = []
+        numeric = self.generator is numeric_data
+        if numeric and numeric_generator is not None:
+            self.generator = numeric_generator
+        for _ in range(connectors):
+            plot = factory()
+            self.widget.addItem(plot)
+            self.connectors.append(DataConnector(plot, max_points=points, ring_buffer=ring_buffer and numeric))
+        self.position = 0
+        if self.generator is None:
+            # Heat map is always replaced as a whole
+            self.resolution = max(1, int(points ** 0.5))
+            self.labels = [str(i) for i in range(self.resolution)]
+        else:
+            for connector in self.connectors:
+                connector.cb_set_data(*self.generator(0, points))
+            self.position = points
+
+    def frame(self) -> int:
+        """Append new data into all connectors and repaint, return number of appended samples"""
+        samples = 0
+        for connector in self.connectors:
+            if self.generator is None:
+                heatmap = np.random.randint(0, 1000, (self.resolution, self.resolution))
+                connector.cb_set_data(self.labels, self.labels, heatmap=heatmap)
+                samples += heatmap.size
+            else:
+                connector.cb_append_data_array(*self.generator(self.position, self.chunk))
+                samples += self.chunk
+        self.position += self.chunk
+        self.app.processEvents()
+        self.widget.repaint()
+        return samples
+
+    def run(self, duration: float, memory_frames: int) -> Dict[str, Any]:
+        latencies = []
+        samples = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            frame_start = time.perf_counter()
+            samples += self.frame()
+            latencies.append(time.perf_counter() - frame_start)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        for _ in range(memory_frames):
+            self.frame()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.widget.close()
+        self.widget.deleteLater()
+        self.app.processEvents()
+        return {"plot": self.plot_type,
+                "points": self.points,
+                "connectors": len(self.connectors),
+                "frames": len(latencies),
+                "duration_s": elapsed,
+                "fps": len(latencies) / elapsed,
+                "ingest_rate": samples / elapsed,
+                "latency_ms": {"mean": float(np.mean(latencies)) * 1e3,
+                               "p50": percentile(latencies, 50) * 1e3,
+                               "p95": percentile(latencies, 95) * 1e3,
+                               "max": max(latencies) * 1e3},
+                "peak_memory_bytes": peak_memory}
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pglive plots using Qt offscreen platform")
+    parser.add_argument("--plots", nargs="+", choices=list(PLOT_TYPES), default=list(PLOT_TYPES))
+    parser.add_argument("--points", nargs="+", type=int, default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--connectors", nargs="+", type=int, default=[1, 10])
+    parser.add_argument("--chunk", type=int, default=10, help="Samples appended into each connector per frame")
+    parser.add_argument("--duration", type=float, default=2., help="Duration of every benchmark in seconds")
+    parser.add_argument("--memory-frames", type=int, default=5, help="Frames measured by tracemalloc")
+    parser.add_argument("--ring-buffer", action="store_true", help="Use ring buffer for numeric plots")
+    parser.add_argument("--no-limit", action="store_true", help="Don't skip point counts too big for plot type")
+    parser.add_argument("--recording", help="Feed numeric plots by y values of StreamRecorder recording")
+    parser.add_argument("--output", help="Write JSON results into file instead of stdout")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    numeric_generator = recorded_data(args.recording) if args.recording else None
+    results = []
+    for plot_type in args.plots:
+        for points in args.points:
+            if not args.no_limit and points > PLOT_TYPES[plot_type][2]:
+                continue
+            for connectors in args.connectors:
+                benchmark = PlotBenchmark(app, plot_type, points, connectors, args.chunk, args.ring_buffer,
+                                          numeric_generator)
+                result = benchmark.run(args.duration, args.memory_frames)
+                print(f"{plot_type:>16} points={points:<8} connectors={connectors:<4} "
+                      f"fps={result['fps']:.1f} latency_p95={result['latency_ms']['p95']:.2f}ms", file=sys.stderr)
+                results.append(result)
+
+    report = {"meta": {"python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "qt": pg.Qt.QT_LIB,
+                       "pyqtgraph": pg.__version__,
+                       "numpy": np.__version__,
+                       "ring_buffer": args.ring_buffer,
+                       "recording": args.recording,
+                       "chunk": args.chunk},
+              "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""
+Compare memory allocations per frame of DataConnector storage backends.
+
+Every frame appends one new sample and converts stored window into arrays the same way
+DataConnector._update_data does before data is passed to plot.setData.
+
+Run with: python -m benchmarks.ring_buffer_allocations [max_points] [frames]
+"""
+import json
+import sys
+import time
+import tracemalloc
+from collections import deque
+from math import sin
+from typing import Any, Dict
+
+import numpy as np
+
+from pglive.sources.ring_buffer import RingBuffer
+
+
+def measure(name: str, x: Any, y: Any, max_points: int, frames: int) -> Dict[str, Any]:
+    """Fill storage and measure allocations of frames append + convert cycles"""
+    for i in range(max_points):
+        x.append(i)
+        y.append(sin(i * 0.01))
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    snapshot_start = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    for i in range(max_points, max_points + frames):
+        x.append(i)
+        y.append(sin(i * 0.01))
+        np.asarray(x)
+        np.asarray(y)
+    duration = time.perf_counter() - start
+    snapshot_end = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = snapshot_end.compare_to(snapshot_start, "filename")
+    allocated_blocks = sum(max(stat.count_diff, 0) for stat in stats)
+    return {"backend": name,
+            "max_points": max_points,
+            "frames": frames,
+            "frame_time_us": duration / frames * 1e6,
+            "peak_frame_bytes": peak,
+            "retained_blocks": allocated_blocks}
+
+
+def main(max_points: int = 50000, frames: int = 200) -> None:
+    results = [
+        measure("deque", deque(maxlen=max_points), deque(maxlen=max_points), max_points, frames),
+        measure("ring_buffer", RingBuffer(max_points), RingBuffer(max_points), max_points, frames),
+        measure("mirrored", RingBuffer(max_points, mirrored=True), RingBuffer(max_points, mirrored=True),
+                max_points, frames),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,103 @@
+"""
+Compare transport of samples from producer process into the GUI process.
+
+Producer process writes samples in chunks either into SharedRingProducer or into multiprocessing.Queue,
+which pickles every chunk. Consumer in this process feeds them into a sink with cb_append_data_array interface,
+so only the transport is measured, not plotting. Reported are throughput in samples per second,
+number of lost samples and consumer CPU time per sample.
+
+Run with: python -m benchmarks.shared_memory [samples] [chunk]
+"""
+import json
+import multiprocessing
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from pglive.sources.shared_ring import SharedRingProducer, SharedRingConsumer
+
+
+class Sink:
+    """Minimal DataConnector replacement, counting received samples"""
+
+    def __init__(self) -> None:
+        self.samples = 0
+
+    def cb_append_data_array(self, y: Any, x: Any) -> None:
+        self.samples += len(y)
+
+
+def chunks(samples: int, chunk: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    for start in range(0, samples, chunk):
+        x = np.arange(start, min(start + chunk, samples), dtype=np.float64)
+        yield np.sin(x * 0.01), x
+
+
+def queue_producer(queue: multiprocessing.Queue, samples: int, chunk: int) -> None:
+    for y, x in chunks(samples, chunk):
+        queue.put((y, x))
+    queue.put(None)
+
+
+def shared_memory_producer(name: str, samples: int, chunk: int) -> None:
+    producer = SharedRingProducer(name=name, create=False)
+    for y, x in chunks(samples, chunk):
+        producer.extend(y, x)
+    producer.close()
+
+
+def result(transport: str, samples: int, received: int, lost: int, elapsed: float, cpu: float) -> Dict[str, Any]:
+    return {"transport": transport,
+            "samples": samples,
+            "received": received,
+            "lost": lost,
+            "duration_s": elapsed,
+            "throughput": received / elapsed,
+            "consumer_cpu_ns_per_sample": cpu / max(received, 1) * 1e9}
+
+
+def bench_queue(samples: int, chunk: int) -> Dict[str, Any]:
+    queue: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=queue_producer, args=(queue, samples, chunk))
+    sink = Sink()
+    start, cpu_start = time.perf_counter(), time.process_time()
+    process.start()
+    item = queue.get()
+    while item is not None:
+        sink.cb_append_data_array(*item)
+        item = queue.get()
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    process.join()
+    return result("multiprocessing.Queue", samples, sink.samples, samples - sink.samples, elapsed, cpu)
+
+
+def bench_shared_memory(samples: int, chunk: int, capacity: int) -> Dict[str, Any]:
+    # Ring is owned by this process, producer process only attaches to it
+    ring = SharedRingProducer(capacity)
+    sink = Sink()
+    consumer = SharedRingConsumer(ring.name, sink, poll_rate=None)
+    process = multiprocessing.Process(target=shared_memory_producer, args=(ring.name, samples, chunk))
+    start, cpu_start = time.perf_counter(), time.process_time()
+    process.start()
+    while process.is_alive() or consumer.position < ring.count:
+        if consumer.poll() == 0:
+            time.sleep(0.0001)
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    process.join()
+    consumer.close()
+    ring.unlink()
+    return result("SharedRingBuffer", samples, sink.samples, consumer.dropped_samples, elapsed, cpu)
+
+
+def main(argv: List[str]) -> None:
+    samples = int(argv[0]) if len(argv) > 0 else 10_000_000
+    chunk = int(argv[1]) if len(argv) > 1 else 1000
+    capacity = max(samples // 4, chunk)
+    results = [bench_queue(samples, chunk), bench_shared_memory(samples, chunk, capacity)]
+    print(json.dumps({"samples": samples, "chunk": chunk, "ring_capacity": capacity, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
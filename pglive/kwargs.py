@@ -28,6 +28,12 @@ class LeadingLine:
     AXIS_X = "x"
     AXIS_Y = "y"
 
+class Decimation:
+    """Decimation methods of DataConnector"""
+    M4 = "M4"  # First, min, max and last point of every pixel column
+    LTTB = "LTTB"  # Largest-Triangle-Three-Buckets, fixed number of points or one point per pixel column
+
+
 class Orientation:
     AUTO = "Auto"
     HORIZONTAL = "Horizontal"
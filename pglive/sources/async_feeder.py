@@ -0,0 +1,92 @@
+import asyncio
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class AsyncFeeder:
+    """
+    Feed DataConnectors from async iterators, so any number of sources can share one asyncio event loop thread.
+    Items arriving between frames are batched per DataConnector and appended once per frame
+    by a single cb_append_data_array call.
+    """
+
+    def __init__(self, frame_rate: float = 60.) -> None:
+        """
+        :param float frame_rate: Rate of appending batched items into DataConnectors in Hz
+        """
+        assert frame_rate > 0
+        self.frame_rate = frame_rate
+        # Pending chunks of every DataConnector as (y, x, is_list_of_points)
+        self._pending: Dict[Any, List[Tuple[Any, Any, bool]]] = {}
+        self._running = False
+
+    def put_point(self, data_connector: Any, y: Any, x: Optional[Any] = None) -> None:
+        """Add one data point into the next batch of data_connector"""
+        chunks = self._pending.setdefault(data_connector, [])
+        # Points with and without x are never merged into one chunk
+        if chunks and chunks[-1][2] and (chunks[-1][1][-1] is None) == (x is None):
+            chunks[-1][0].append(y)
+            chunks[-1][1].append(x)
+        else:
+            chunks.append(([y], [x], True))
+
+    def put_array(self, data_connector: Any, y: Any, x: Optional[Any] = None) -> None:
+        """Add array of data into the next batch of data_connector"""
+        self._pending.setdefault(data_connector, []).append((y, x, False))
+
+    async def feed(self, source: AsyncIterable, *data_connectors: Any, arrays: bool = False) -> None:
+        """
+        Consume source until it's exhausted and put its items into batches of all data_connectors.
+        Item is y or tuple (y, x). With arrays=False every item is one data point, otherwise y and x are arrays.
+        If x is missing, it's generated by DataConnector.
+        """
+        put = self.put_array if arrays else self.put_point
+        async for item in source:
+            y, x = item if isinstance(item, tuple) and len(item) == 2 else (item, None)
+            for data_connector in data_connectors:
+                put(data_connector, y, x)
+
+    def add_source(self, source: AsyncIterable, *data_connectors: Any, arrays: bool = False) -> asyncio.Task:
+        """Start feeding data_connectors from source in the running event loop"""
+        return asyncio.ensure_future(self.feed(source, *data_connectors, arrays=arrays))
+
+    def flush(self) -> None:
+        """
+        Append all batched items into their DataConnectors by one cb_append_data_array call per DataConnector,
+        so update_rate and data_lock of DataConnector can't drop just a part of the batch.
+        """
+        pending, self._pending = self._pending, {}
+        for data_connector, chunks in pending.items():
+            implicit = [x is None or (point and x[0] is None) for _, x, point in chunks]
+            if len(chunks) == 1:
+                y, x, _ = chunks[0]
+                data_connector.cb_append_data_array(y, None if implicit[0] else x)
+                continue
+            ys = [np.asarray(chunk_y) for chunk_y, _, _ in chunks]
+            if all(implicit):
+                data_connector.cb_append_data_array(np.concatenate(ys), None)
+                continue
+            # Chunks without x get x continuing after the previous chunk, the same way DataConnector generates it
+            last = data_connector.x[-1] if len(data_connector.x) > 0 else -1
+            xs = []
+            for chunk_y, (_, chunk_x, _), chunk_implicit in zip(ys, chunks, implicit):
+                chunk_x = np.arange(last + 1, last + 1 + chunk_y.size) if chunk_implicit else np.asarray(chunk_x)
+                if chunk_x.size > 0:
+                    last = chunk_x[-1]
+                xs.append(chunk_x)
+            data_connector.cb_append_data_array(np.concatenate(ys), np.concatenate(xs))
+
+    async def run(self) -> None:
+        """Append batched items once per frame until stop is called"""
+        self._running = True
+        try:
+            while self._running:
+                self.flush()
+                await asyncio.sleep(1 / self.frame_rate)
+        finally:
+            self.flush()
+
+    def stop(self) -> None:
+        """Stop run loop after the current frame"""
+        self._running = False
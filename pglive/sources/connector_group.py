@@ -0,0 +1,115 @@
+import time
+from math import inf
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from pyqtgraph.Qt import QtCore  # type: ignore
+
+from pglive.sources.data_connector import DataConnector
+
+
+class ConnectorGroup(QtCore.QObject):
+    """
+    Update many DataConnectors at once, e.g. all series of one acquisition frame.
+    Data of all connectors are written in one critical section holding data_lock of every connector,
+    so plots never show one series newer than the others. Plots are updated by one signal
+    and view range of every LivePlotWidget is calculated and set at most once per group update.
+    """
+    sig_new_data = QtCore.Signal(object, dict)
+    paused: bool = False
+    # Last update time, using perf_counter for most precise counter
+    last_update: float = 0.
+    last_plot: float = 0.
+
+    def __init__(self, data_connectors: Sequence[DataConnector], update_rate: float = inf,
+                 plot_rate: float = inf) -> None:
+        """
+        :param data_connectors: DataConnectors updated together
+        :param float update_rate: Update rate of the whole group in Hz
+        :param float plot_rate: Plot rate of the whole group in Hz
+        """
+        super().__init__()
+        assert len(data_connectors) > 0
+        self.data_connectors = list(data_connectors)
+        self._members = set(self.data_connectors)
+        # Locks are always acquired in the same order, so groups sharing connectors can't deadlock
+        self._locks = [data_connector.data_lock for data_connector in sorted(self._members, key=id)]
+        self.update_timeout = 1 / update_rate
+        self.plot_timeout = 1 / plot_rate
+        self.sig_new_data.connect(self.slot_new_data)
+
+    def pause(self) -> None:
+        """Pause data plotting of the group"""
+        self.paused = True
+
+    def resume(self) -> None:
+        """Resume data plotting of the group"""
+        self.paused = False
+
+    def _items(self, values: Union[Dict[DataConnector, Any], Sequence]) -> List[Tuple[DataConnector, Any]]:
+        """Pair values with DataConnectors, values are dict of DataConnectors or sequence in order of the group"""
+        if isinstance(values, dict):
+            unknown = [data_connector for data_connector in values if data_connector not in self._members]
+            if unknown:
+                # Data lock of other connectors is not held by the group
+                raise ValueError(f"{len(unknown)} DataConnectors are not members of the group")
+            return list(values.items())
+        if len(values) != len(self.data_connectors):
+            raise ValueError(f"Expected {len(self.data_connectors)} values, got {len(values)}")
+        return list(zip(self.data_connectors, values))
+
+    def _write(self, items: List[Tuple[DataConnector, Any]], x: Optional[Any], point: bool, kwargs: Dict) -> None:
+        """Write data of all DataConnectors while holding all their locks and emit them as one update"""
+        if self.paused or (time.perf_counter() - self.last_update) < self.update_timeout:
+            return
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            updates = []
+            for data_connector, y in items:
+                if data_connector.paused:
+                    continue
+                # Data staged by lossless connector are older than data of the group
+                samples, _ = data_connector._write_staged()
+                tick = data_connector.rolling_index
+                if point:
+                    samples += data_connector._append_point(y, x)
+                else:
+                    samples += data_connector._append_array(y, x)
+                data_connector.last_update = time.perf_counter()
+                updates.append((data_connector, tick, samples))
+                data_connector.rolling_index += samples
+            self.last_update = time.perf_counter()
+            if not updates or self.paused or (self.last_update - self.last_plot) < self.plot_timeout:
+                return
+            # Data of all connectors are taken in the same critical section as they were written
+            self.sig_new_data.emit([(data_connector, *data_connector._data_arrays(), tick + samples - 1)
+                                    for data_connector, tick, samples in updates], kwargs)
+            self.last_plot = time.perf_counter()
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def cb_append_data_point(self, values: Union[Dict[DataConnector, Any], Sequence],
+                             x: Optional[Union[int, float]] = None, **kwargs) -> None:
+        """
+        Append one data point into every DataConnector of values.
+        Shared x keeps all series at the same timestamp, each DataConnector generates its own x if None.
+        """
+        self._write(self._items(values), x, True, kwargs)
+
+    def cb_append_data_array(self, values: Union[Dict[DataConnector, Any], Sequence], x: Optional[Any] = None,
+                             **kwargs) -> None:
+        """Append array of data into every DataConnector of values, all arrays share the same x"""
+        self._write(self._items(values), x, False, kwargs)
+
+    def slot_new_data(self, updates: List[Tuple[DataConnector, Any, Any, int]], kwargs: Dict) -> None:
+        """Plot data of all updated DataConnectors and calculate view range once per LivePlotWidget"""
+        widgets: Dict[Any, Dict[DataConnector, int]] = {}
+        for data_connector, y, x, tick in updates:
+            data_connector.slot_new_data(y, x, kwargs)
+            plot_widget = getattr(data_connector.plot, "plot_widget", None)
+            if plot_widget is None:
+                raise Exception("Plot must be added into LivePlotWidget before setting any data.")
+            widgets.setdefault(plot_widget, {})[data_connector] = tick
+        for plot_widget, ticks in widgets.items():
+            plot_widget.slot_roll_ticks(ticks)
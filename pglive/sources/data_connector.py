@@ -1,16 +1,25 @@
 import copy
 import time
+from bisect import bisect_left, bisect_right
 import warnings
 from collections import deque
 from math import inf
 from threading import Lock
-from typing import List, Union, Deque, Optional
+from typing import List, Union, Deque, Optional, Any, Callable, Dict, Tuple
 
 import numpy as np
 from pyqtgraph import PlotDataItem  # type: ignore
 from pyqtgraph.Qt import QtCore  # type: ignore
 
+from pglive.sources.decimation import is_sorted
+from pglive.sources.history_store import HistoryStore
 from pglive.sources.live_plot import MixinLivePlot, MixinLiveBarPlot, make_live
+from pglive.sources.lod_pyramid import LodPyramid
+from pglive.sources.range_index import RangeExtremaIndex
+from pglive.sources.ring_buffer import RingBuffer, GrowingBuffer, _as_1d_array
+from pglive.sources.rolling_extrema import RollingExtrema
+from pglive.sources.stats import ConnectorStats, time_paint
+from pglive.sources.streaming_quantile import QuantileRange
 from pglive.sources.utils import NUM_LIST, NUM
 
 # numpy >= 1.25 compatibility
@@ -21,6 +30,33 @@ except ImportError:
 warnings.filterwarnings("ignore", category=VisibleDeprecationWarning)
 
 
+class _DrainingLock:
+    """
+    data_lock of lossless DataConnector, staged data are drained whenever any holder releases the lock,
+    so data staged while other thread was holding the lock are never left behind
+    """
+
+    def __init__(self, lock: Lock, drain: Callable[[], None]) -> None:
+        self.lock = lock
+        self._drain = drain
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return self.lock.acquire(blocking, timeout)
+
+    def release(self) -> None:
+        self.lock.release()
+        self._drain()
+
+    def locked(self) -> bool:
+        return self.lock.locked()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *args: Any) -> None:
+        self.release()
+
+
 class DataConnector(QtCore.QObject):
     sig_new_data = QtCore.Signal(object, object, dict)
     sig_data_roll_tick = QtCore.Signal(object, int)
@@ -28,13 +64,20 @@ class DataConnector(QtCore.QObject):
     sig_paused = QtCore.Signal()
     sig_resumed = QtCore.Signal()
     sig_clear = QtCore.Signal()
+    sig_stats = QtCore.Signal(object)
     paused: bool = False
     # Last update time, using perf_counter for most precise counter
     last_update: float = 0.
     last_plot: float = 0.
 
     def __init__(self, plot: Union[MixinLivePlot, MixinLiveBarPlot], max_points: float = inf, update_rate: float = inf,
-                 plot_rate: float = inf, ignore_auto_range: bool = False) -> None:
+                 plot_rate: float = inf, ignore_auto_range: bool = False, ring_buffer: bool = False,
+                 dtype: Any = None, mirrored: bool = False, lossless: bool = False,
+                 collect_stats: bool = False, decimation: Optional[str] = None,
+                 decimation_points: Optional[int] = None, lod: bool = False, lod_factor: int = 4,
+                 track_bounds: bool = False, range_index: bool = False, history: Optional[str] = None,
+                 history_chunk_size: int = 2 ** 20, max_age: Optional[float] = None, x_dtype: Any = None,
+                 quantiles: Optional[Tuple[float, float]] = None) -> None:
         """
         DataConnector is connecting plot with data and makes sure, that all updates are thread-safe.
         To make plot compatible and work with Connector, it must implement slot_new_data method.
@@ -47,16 +90,75 @@ class DataConnector(QtCore.QObject):
         :param float update_rate: Update rate in Hz
         :param float plot_rate: Plot rate in Hz
         :param bool ignore_auto_range: If set to True auto range is not calculated when new data is acquired
+        :param bool ring_buffer: Store numeric data in preallocated NumPy ring buffer instead of deque,
+                                 NumPy buffer growing by doubling is used if max_points is inf
+        :param dtype: NumPy dtype of y storage, e.g. float32 or int16. Data are converted once when stored,
+                      implies ring_buffer. Defaults to float64
+        :param bool mirrored: Use mirrored ring buffer, current data window is passed to plot without any copy,
+                              implies ring_buffer
+        :param bool lossless: Never drop data when data_lock is held by other thread. Data are put into staging
+                              queue instead and drained into storage in bulk once data_lock is released
+        :param bool collect_stats: Collect performance stats, available by stats.snapshot() and
+                                   emitted by sig_stats every stats.interval seconds
+        :param str decimation: Decimation method, one of pglive.kwargs.Decimation. Plotted data are reduced
+                               to the pixel resolution of the plot, full resolution data stays in connector
+        :param int decimation_points: Target number of points of LTTB decimation, one point per pixel column if None
+        :param bool lod: Maintain level of detail pyramid of unbounded history with sorted x, plot gets only data
+                         visible in the view, in resolution of plot width. Requires max_points=inf, implies ring_buffer
+        :param int lod_factor: Number of samples aggregated into one block of the next pyramid level
+        :param bool track_bounds: Maintain minimum and maximum of x and y incrementally on every append,
+                                  so plot bounds are available in O(1) instead of scanning all data.
+                                  Requires numeric data
+        :param bool range_index: Maintain segment tree of x and y, so bounds of last samples or of samples visible
+                                 in zoomed view are calculated in O(log N). Requires numeric data and sorted x
+        :param str history: Directory of memory-mapped history store. All data are appended to disk, only last
+                            max_points are kept in memory. Existing history is reopened and plotting resumes
+                            with its last max_points. Requires finite max_points, numeric data and sorted x
+        :param int history_chunk_size: Number of samples in one chunk file of a new history store
+        :param float max_age: Keep only samples with x not older than max_age behind the last x, older samples
+                              are dropped in bulk after every update. Requires sorted numeric x,
+                              can't be combined with lod or quantiles. History store still keeps all data
+        :param x_dtype: NumPy dtype of x storage, implies ring_buffer. Defaults to dtype if it's floating point
+                        dtype, float64 otherwise, so integer y doesn't limit range of x
+        :param tuple quantiles: Low and high quantile of y, e.g. (0.001, 0.999), estimated by streaming quantile
+                                sketch in O(1) per sample. Used by LiveAxisRange(quantile_range=True) to ignore
+                                outliers. Requires numeric data, can't be combined with max_age
         """
         super().__init__()
         self.rolling_index = 0
         self.ignore_auto_range = ignore_auto_range
+        if lod and max_points != inf:
+            raise ValueError("Level of detail pyramid requires max_points=inf")
+        if history is not None and max_points == inf:
+            raise ValueError("History store requires finite max_points")
+        if max_age is not None:
+            if lod:
+                raise ValueError("Level of detail pyramid can't drop data by max_age")
+            if quantiles is not None:
+                raise ValueError("Streaming quantiles can't drop data by max_age")
+            assert max_age > 0
+        self.max_age = max_age
+        self.ring_buffer = ring_buffer or mirrored or lod or dtype is not None or x_dtype is not None
+        self.mirrored = mirrored
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+        if x_dtype is None:
+            x_dtype = self.dtype if self.dtype.kind == "f" else np.float64
+        self.x_dtype = np.dtype(x_dtype)
+        self.lossless = lossless
+        self.decimation = decimation
+        self.decimation_points = decimation_points
+        # Number of data points dropped because of data_lock being held, always 0 in lossless mode
+        self.dropped_samples = 0
+        # Staging queue of lossless mode, deque append and popleft are atomic
+        self._staging: Deque[Tuple[Callable, Any, Any, Dict]] = deque()
+        self.stats: Optional[ConnectorStats] = ConnectorStats() if collect_stats else None
 
         if not isinstance(plot, (MixinLivePlot, MixinLiveBarPlot)):
             # Attempt to convert plot into live if it's not already
             make_live(plot)
         # Data update lock, ensuring thread-safety
-        self.data_lock = Lock()
+        self._lock = Lock()
+        self.data_lock: Union[Lock, _DrainingLock] = _DrainingLock(self._lock, self._drain) if lossless else self._lock
         # Maximum number of points to plot
         self.max_points = max_points
         # Calculating update timeout from update_rate frequency
@@ -65,20 +167,50 @@ class DataConnector(QtCore.QObject):
         self.tick_position_indexes = None
         self.plot = plot
         # Set plot and connect sig_new_data with plot.slot_new_data
-        self.sig_new_data.connect(self.plot.slot_new_data)
+        if self.stats is not None:
+            self.sig_new_data.connect(self.slot_new_data)
+            time_paint(self.plot, self.stats)
+        else:
+            self.sig_new_data.connect(self.plot.slot_new_data)
         self.sig_data_toggle.connect(self.plot.slot_connector_toggle)
         self.sig_data_roll_tick.connect(self.plot.slot_roll_tick)
         self.sig_clear.connect(self.plot.clear)
-        self.x: Union[NUM_LIST, Deque[NUM], List]
-        self.y: Union[NUM_LIST, Deque[NUM], List]
-        if self.max_points == inf:
-            # Use simple list if there is no point limits
-            self.x = []
-            self.y = []
-        else:
-            # Use deque with maxlen otherwise
-            self.x = deque(maxlen=int(self.max_points))
-            self.y = deque(maxlen=int(self.max_points))
+        self.x: Union[NUM_LIST, Deque[NUM], List, np.ndarray, RingBuffer, GrowingBuffer] = \
+            self._make_storage(dtype=self.x_dtype)
+        self.y: Union[NUM_LIST, Deque[NUM], List, np.ndarray, RingBuffer, GrowingBuffer] = self._make_storage()
+        self.lod: Optional[LodPyramid] = None
+        if lod:
+            # Level of detail implies ring_buffer with max_points=inf
+            assert isinstance(self.x, GrowingBuffer) and isinstance(self.y, GrowingBuffer)
+            self.lod = LodPyramid(self.x, self.y, lod_factor)
+        # Rolling minimum and maximum of stored data, window follows storage maxlen
+        self.x_extrema: Optional[RollingExtrema] = None
+        self.y_extrema: Optional[RollingExtrema] = None
+        if track_bounds:
+            self.x_extrema = RollingExtrema(getattr(self.x, "maxlen", None))
+            self.y_extrema = RollingExtrema(getattr(self.y, "maxlen", None))
+        # Segment trees of stored data, window follows storage maxlen
+        self.x_index: Optional[RangeExtremaIndex] = None
+        self.y_index: Optional[RangeExtremaIndex] = None
+        if range_index:
+            self.x_index = RangeExtremaIndex(getattr(self.x, "maxlen", None))
+            self.y_index = RangeExtremaIndex(getattr(self.y, "maxlen", None))
+        # Streaming quantiles of stored y, window follows storage maxlen
+        self.y_quantiles: Optional[QuantileRange] = None
+        if quantiles is not None:
+            self.y_quantiles = QuantileRange(*quantiles, window=getattr(self.y, "maxlen", None))
+        # Bounds of x and y of the last plotted data, set only if track_bounds is enabled
+        self.bounds: Optional[Tuple[Tuple[Any, Any], Tuple[Any, Any]]] = None
+        # Stored x is non-decreasing, checked only for written data, so plots don't scan x on every frame
+        self.x_sorted = True
+        self.history: Optional[HistoryStore] = None
+        if history is not None:
+            store = HistoryStore(history, self.dtype, history_chunk_size, self.x_dtype)
+            if len(store) > 0:
+                # Resume with the live window of stored history
+                self._set_data(*store.read(len(store) - int(self.max_points), len(store)))
+                self.rolling_index = len(self.x)
+            self.history = store
 
         def toggle_plot_visibility(flag):
             """Override setVisible of PlotDataItem"""
@@ -97,6 +229,38 @@ class DataConnector(QtCore.QObject):
         assert new_max_len > 0
         self._max_len = new_max_len
 
+    def _make_storage(self, data: Optional[Any] = None,
+                      dtype: Optional[Any] = None) -> Union[List, Deque, np.ndarray, RingBuffer, GrowingBuffer]:
+        """Create new data storage according to max_points and ring_buffer flag, dtype of ring buffer defaults to y"""
+        if isinstance(data, np.ndarray) and (self.max_points != inf or self.max_age is not None):
+            # Deque can't hold ndarray without conversion, unlimited storage keeps it until data are appended
+            data = data.tolist()
+        if self.ring_buffer:
+            dtype = self.dtype if dtype is None else dtype
+            if self.max_points == inf:
+                return GrowingBuffer(dtype)
+            return RingBuffer(int(self.max_points), dtype, mirrored=self.mirrored)
+        elif self.max_points == inf:
+            # Use simple list (or ndarray set by set_data) if there is no point limits
+            return [] if data is None else data
+        else:
+            # Use deque with maxlen otherwise
+            return deque(() if data is None else data, maxlen=int(self.max_points))
+
+    def slot_new_data(self, y: Any, x: Any, kwargs: Dict) -> None:
+        """Plot new data and measure duration of plot.slot_new_data"""
+        if self.stats is None:
+            self.plot.slot_new_data(y, x, kwargs)
+            return
+        start = time.perf_counter()
+        self.plot.slot_new_data(y, x, kwargs)
+        self.stats.slot_new_data.add(time.perf_counter() - start)
+
+    def _lock_acquired(self, wait_start: float) -> None:
+        """Record time spent waiting for data_lock"""
+        if self.stats is not None:
+            self.stats.lock_wait.add(time.perf_counter() - wait_start)
+
     def pause(self) -> None:
         """Pause data plotting"""
         self.paused = True
@@ -110,113 +274,342 @@ class DataConnector(QtCore.QObject):
     def clear(self) -> None:
         """Clear all data"""
         with self.data_lock:
-            self.x.clear()
-            self.y.clear()
+            self._staging.clear()
+            if isinstance(self.x, np.ndarray) or isinstance(self.y, np.ndarray):
+                # ndarrays kept by set_data can't be cleared in place
+                self.x, self.y = self._make_storage(dtype=self.x_dtype), self._make_storage()
+            else:
+                self.x.clear()
+                self.y.clear()
+            if self.lod is not None:
+                self.lod.clear()
+            self._update_indexes((), (), reset=True)
+            self.bounds = None
+            if self.history is not None:
+                self.history.clear()
             self.rolling_index = 0
             self.tick_position_indexes = None
+            frame_scheduler = getattr(getattr(self.plot, "plot_widget", None), "frame_scheduler", None)
+            if frame_scheduler is not None:
+                frame_scheduler.discard(self)
             self.sig_clear.emit()
             self.sig_data_roll_tick.emit(self, 0)
 
-    def _skip_update(self) -> bool:
+    def _skip_update(self, samples: int = 1) -> bool:
         """Skip data update"""
-        return self.paused or (time.perf_counter() - self.last_update) < self.update_timeout or self.data_lock.locked()
+        if self.paused:
+            return True
+        if (time.perf_counter() - self.last_update) < self.update_timeout:
+            if self.stats is not None:
+                self.stats.samples_skipped += samples
+            return True
+        if not self.lossless and self.data_lock.locked():
+            # Data are lost, because other thread is holding data_lock
+            self.dropped_samples += samples
+            if self.stats is not None:
+                self.stats.samples_dropped += samples
+            return True
+        return False
 
     def _skip_plot(self) -> bool:
         """Skip data plot"""
-        return self.paused or (time.perf_counter() - self.last_plot) < self.plot_timeout
+        if self.paused:
+            return True
+        if (time.perf_counter() - self.last_plot) < self.plot_timeout:
+            if self.stats is not None:
+                self.stats.frames_skipped += 1
+            return True
+        return False
 
-    def _update_data(self, **kwargs):
-        """Update data and last update time"""
-        # Notify all connected plots
+    def _data_arrays(self) -> Tuple[Any, np.ndarray]:
+        """Get y and x data to be plotted and store their bounds, must be called with data_lock acquired"""
+        if self.x_extrema is not None and self.y_extrema is not None:
+            self.bounds = (self.x_extrema.bounds(), self.y_extrema.bounds())
         try:
-            self.sig_new_data.emit(np.asarray(self.y), np.asarray(self.x), kwargs)
+            return np.asarray(self.y), np.asarray(self.x)
         except ValueError:
-            self.sig_new_data.emit(copy.copy(self.y), np.asarray(self.x), kwargs)
+            return copy.copy(self.y), np.asarray(self.x)
+
+    def _update_data(self, tick: int, **kwargs):
+        """Update data and last update time"""
+        frame_scheduler = getattr(getattr(self.plot, "plot_widget", None), "frame_scheduler", None)
+        if frame_scheduler is not None:
+            # Plot data in the next frame of LivePlotWidget
+            frame_scheduler.mark_dirty(self, tick, kwargs)
+        else:
+            # Notify all connected plots
+            self.sig_new_data.emit(*self._data_arrays(), kwargs)
+            self.sig_data_roll_tick.emit(self, tick)
         self.last_plot = time.perf_counter()
+        if self.stats is not None:
+            self.stats.frames_emitted += 1
+            if self.stats.emit_due():
+                self.sig_stats.emit(self.stats.snapshot())
+                self.stats.reset()
 
-    def cb_set_data(self, y: List[Union[int, float]], x: Optional[NUM_LIST] = None, **kwargs) -> None:
-        """Replace current data"""
-        if self._skip_update():
+    def _update_tick_positions(self) -> None:
+        if self.tick_position_indexes is not None:
+            if len(self.tick_position_indexes) == 0:
+                self.tick_position_indexes.append(0.0)
+            elif len(self.tick_position_indexes) == self.tick_position_indexes.maxlen:
+                self.tick_position_indexes.rotate(-1)
+            else:
+                self.tick_position_indexes.append(self.tick_position_indexes[-1] + 1.0)
+
+    def _update_indexes(self, y: Any, x: Any, reset: bool = False) -> None:
+        """Add appended data into bound trackers and range indexes, must be called with data_lock acquired"""
+        self._update_x_sorted(x, reset)
+        for tracker, values in ((self.x_extrema, x), (self.y_extrema, y), (self.x_index, x), (self.y_index, y),
+                                (self.y_quantiles, y)):
+            if tracker is not None:
+                if reset:
+                    tracker.clear()
+                tracker.extend(values)
+
+    def _update_x_sorted(self, x: Any, reset: bool = False) -> None:
+        """Check whether appended x keeps stored x sorted, must be called with data_lock acquired"""
+        if reset:
+            self.x_sorted = True
+        if not self.x_sorted or len(x) == 0:
             return
+        # Last x stored before appended data
+        previous = len(self.x) - len(x) - 1
+        try:
+            self.x_sorted = ((len(x) == 1 or is_sorted(np.asarray(x)))
+                             and (previous < 0 or bool(x[0] >= self.x[previous])))
+        except TypeError:
+            # Not comparable x
+            self.x_sorted = False
 
-        with self.data_lock:
-            if self.max_points == inf:
-                self.y = y
+    def _drop_old(self) -> None:
+        """
+        Drop samples older than max_age by one binary search and one slice, must be called with data_lock acquired.
+        Ring buffer is searched by np.searchsorted. Indexing of deque, used for limited max_points without
+        ring_buffer, walks its blocks, so every probe of the search costs up to O(N) there.
+        """
+        if self.max_age is None or len(self.x) == 0:
+            return
+        if isinstance(self.x, (RingBuffer, GrowingBuffer)):
+            count = self.x.searchsorted(self.x[-1] - self.max_age)
+        else:
+            count = bisect_left(self.x, self.x[-1] - self.max_age)
+        if count == 0:
+            return
+        for storage in (self.x, self.y):
+            if isinstance(storage, (RingBuffer, GrowingBuffer)):
+                storage.drop(count)
+            elif isinstance(storage, deque):
+                for _ in range(count):
+                    storage.popleft()
             else:
-                self.y = deque(y, maxlen=int(self.max_points))
+                # ndarray is kept by set_data only without max_age
+                assert not isinstance(storage, np.ndarray)
+                del storage[:count]
+        for tracker in (self.x_extrema, self.y_extrema, self.x_index, self.y_index):
+            if tracker is not None:
+                tracker.drop(count)
+
+    def tail_bounds(self, ax: int = 0, samples: int = 0) -> Tuple[Any, Any]:
+        """
+        Return minimum and maximum of last samples of x (ax=0) or y (ax=1) in O(log N), all samples if 0.
+        Requires range_index. Called without data_lock, because plots are updated while data_lock is held,
+        data appended meanwhile by other thread can make result one update newer than the plotted data.
+        """
+        index = self.x_index if ax == 0 else self.y_index
+        assert index is not None, "tail_bounds requires range_index"
+        count = index.count
+        return index.bounds(count - samples if samples > 0 else 0, count)
+
+    def visible_bounds(self, x_min: NUM, x_max: NUM) -> Tuple[Any, Any]:
+        """
+        Return minimum and maximum of y for samples with x in [x_min, x_max] in O(log N).
+        Requires range_index, called without data_lock same as tail_bounds.
+        """
+        assert self.y_index is not None, "visible_bounds requires range_index"
+        # Sorted x is searched in place, without conversion into array
+        first = self.y_index.count - len(self.y)
+        return self.y_index.bounds(first + bisect_left(self.x, x_min), first + bisect_right(self.x, x_max))
+
+    def _set_data(self, y: Any, x: Optional[Any]) -> int:
+        """Replace stored data, must be called with data_lock acquired"""
+        if self.ring_buffer:
+            # Reuse preallocated buffers
+            assert isinstance(self.x, (RingBuffer, GrowingBuffer)) and isinstance(self.y, (RingBuffer, GrowingBuffer))
+            self.y.replace(y)
+            self.x.replace(np.arange(len(self.y)) if x is None else x)
+        else:
+            self.y = self._make_storage(y)
             if x is not None:
-                if self.max_points == inf:
-                    self.x = x
-                else:
-                    self.x = deque(x, maxlen=int(self.max_points))
+                self.x = self._make_storage(x)
+            elif isinstance(self.y, np.ndarray):
+                self.x = np.arange(len(self.y))
             else:
                 self.x = list(range(len(self.y)))
+        if self.lod is not None:
+            self.lod.clear()
+            self.lod.update()
+        self._update_indexes(self.y, self.x, reset=True)
+        self._drop_old()
+        if self.history is not None:
+            self.history.replace(y, np.arange(len(y)) if x is None else x)
+        if self.stats is not None:
+            self.stats.samples_ingested += len(y)
+        return len(self.x)
+
+    def _append_point(self, y: Any, x: Optional[NUM]) -> int:
+        """Append one data point, must be called with data_lock acquired"""
+        self._ndarray_to_list()
+        assert not isinstance(self.x, np.ndarray) and not isinstance(self.y, np.ndarray)
+        self.y.append(y)
+        if x is not None:
+            self.x.append(x)
+        elif len(self.x) == 0:
+            self.x.append(0)
+        else:
+            self.x.append(self.x[-1] + 1)
+        if self.lod is not None:
+            self.lod.update()
+        # Stored values, ring buffer converts them into its dtype
+        self._update_indexes((self.y[-1],), (self.x[-1],))
+        self._drop_old()
+        if self.history is not None:
+            self.history.append(y, self.x[-1])
+        self._update_tick_positions()
+        if self.stats is not None:
+            self.stats.samples_ingested += 1
+        return 1
+
+    def _ndarray_to_list(self) -> None:
+        """Convert ndarrays kept by set_data into lists before appending, must be called with data_lock acquired"""
+        if isinstance(self.y, np.ndarray):
+            self.y = self.y.tolist()
+        if isinstance(self.x, np.ndarray):
+            self.x = self.x.tolist()
+
+    def _append_array(self, y: Any, x: Optional[Any]) -> int:
+        """Append array of data, must be called with data_lock acquired"""
+        if x is None:
+            # Generate implicit x, continuing after the last x value
+            start = self.x[-1] + 1 if len(self.x) > 0 else 0
+            x = np.arange(start, start + len(y))
+        if self.ring_buffer:
+            # Vectorised copy into NumPy buffers, converted once, so trackers get the stored values
+            assert isinstance(self.x, (RingBuffer, GrowingBuffer)) and isinstance(self.y, (RingBuffer, GrowingBuffer))
+            y = _as_1d_array(y).astype(self.y.dtype, copy=False)
+            x = _as_1d_array(x).astype(self.x.dtype, copy=False)
+            self.y.extend(y)
+            self.x.extend(x)
+        else:
+            self._ndarray_to_list()
+            assert not isinstance(self.x, np.ndarray) and not isinstance(self.y, np.ndarray)
+            self.y.extend(y.tolist() if isinstance(y, np.ndarray) else y)
+            self.x.extend(x.tolist() if isinstance(x, np.ndarray) else x)
+        if self.lod is not None:
+            self.lod.update()
+        self._update_indexes(y, x)
+        self._drop_old()
+        if self.history is not None:
+            self.history.extend(y, x)
+        self._update_tick_positions()
+        if self.stats is not None:
+            self.stats.samples_ingested += len(y)
+        return len(y)
+
+    def _stage(self, write: Callable, y: Any, x: Optional[Any], kwargs: Dict) -> None:
+        """Put data into staging queue and try to drain it into connector storage"""
+        self._staging.append((write, y, x, kwargs))
+        self._drain()
+
+    def _write_staged(self) -> Tuple[int, Dict]:
+        """
+        Write all staged data into storage, must be called with data_lock acquired.
+        Return number of samples written after the last set data and merged kwargs.
+        """
+        samples: int = 0
+        kwargs: Dict = {}
+        while self._staging:
+            write, y, x, item_kwargs = self._staging.popleft()
+            if write == self._set_data:
+                samples = 0
+                self.rolling_index = 0
+            samples += write(y, x)
+            kwargs.update(item_kwargs)
+        return samples, kwargs
+
+    def _drain(self) -> None:
+        """
+        Move all staged data into storage in bulk under the data_lock.
+        If data_lock is held by other thread, data stays staged and is drained once the holder releases data_lock.
+        """
+        while self._staging and self._lock.acquire(blocking=False):
+            try:
+                samples, kwargs = self._write_staged()
+                self.last_update = time.perf_counter()
+
+                if samples > 0 and not self._skip_plot():
+                    self._update_data(self.rolling_index + samples - 1, **kwargs)
+                    self.rolling_index += samples
+            finally:
+                self._lock.release()
+
+    def flush(self) -> None:
+        """Drain staged data of lossless connector and write history store to disk"""
+        self._drain()
+        if self.history is not None:
+            self.history.flush()
+
+    def cb_set_data(self, y: Union[List[Union[int, float]], np.ndarray],
+                    x: Optional[Union[NUM_LIST, np.ndarray]] = None, **kwargs) -> None:
+        """Replace current data, ndarray of any numeric dtype is copied directly into NumPy buffers"""
+        if self._skip_update(len(y)):
+            return
+        if self.lossless:
+            self._stage(self._set_data, y, x, kwargs)
+            return
 
+        wait_start = time.perf_counter()
+        with self.data_lock:
+            self._lock_acquired(wait_start)
+            self._set_data(y, x)
             self.last_update = time.perf_counter()
 
             if not self._skip_plot():
-                self._update_data(**kwargs)
-                self.sig_data_roll_tick.emit(self, len(self.x) - 1)
+                self._update_data(len(self.x) - 1, **kwargs)
                 self.rolling_index = len(self.x)
 
     def cb_append_data_point(self, y: Union[int, float], x: Optional[Union[int, float]] = None, **kwargs) -> None:
         """Append new data point"""
         if self._skip_update():
             return
+        if self.lossless:
+            self._stage(self._append_point, y, x, kwargs)
+            return
 
+        wait_start = time.perf_counter()
         with self.data_lock:
-            self.y.append(y)
-            if x is not None:
-                self.x.append(x)
-            elif len(self.x) == 0:
-                self.x.append(0)
-            else:
-                self.x.append(self.x[-1] + 1)
-            if self.tick_position_indexes is not None:
-                if len(self.tick_position_indexes) == 0:
-                    self.tick_position_indexes.append(0.0)
-                elif len(self.tick_position_indexes) == self.tick_position_indexes.maxlen:
-                    self.tick_position_indexes.rotate(-1)
-                else:
-                    self.tick_position_indexes.append(self.tick_position_indexes[-1] + 1.0)
+            self._lock_acquired(wait_start)
+            self._append_point(y, x)
             self.last_update = time.perf_counter()
 
             if not self._skip_plot():
-                self._update_data(**kwargs)
-                self.sig_data_roll_tick.emit(self, self.rolling_index)
+                self._update_data(self.rolling_index, **kwargs)
                 self.rolling_index += 1
 
-    def cb_append_data_array(self, y: List[Union[int, float]], x: Optional[NUM_LIST] = None, **kwargs) -> None:
-        """Append array of data to existing dataset"""
-        if self._skip_update():
+    def cb_append_data_array(self, y: Union[List[Union[int, float]], np.ndarray],
+                             x: Optional[Union[NUM_LIST, np.ndarray]] = None, **kwargs) -> None:
+        """Append array of data to existing dataset, ndarray is copied with one slice assignment into NumPy buffers"""
+        if self._skip_update(len(y)):
+            return
+        if self.lossless:
+            self._stage(self._append_array, y, x, kwargs)
             return
 
+        wait_start = time.perf_counter()
         with self.data_lock:
-            if self.max_points == inf:
-                # Concat two lists
-                self.y += y
-                if x is not None:
-                    self.x += x
-                else:
-                    self.x += list(range(self.x[-1], self.x[-1] + len(y), 1))
-            else:
-                # Concat two queues
-                self.y += deque(y)
-                if x is not None:
-                    self.x += deque(x)
-                else:
-                    self.x += deque(range(self.x[-1], self.x[-1] + len(y), 1))
-
-            if self.tick_position_indexes is not None:
-                if len(self.tick_position_indexes) == 0:
-                    self.tick_position_indexes.append(0.0)
-                elif len(self.tick_position_indexes) == self.tick_position_indexes.maxlen:
-                    self.tick_position_indexes.rotate(-1)
-                else:
-                    self.tick_position_indexes.append(self.tick_position_indexes[-1] + 1.0)
+            self._lock_acquired(wait_start)
+            self._append_array(y, x)
             self.last_update = time.perf_counter()
 
             if not self._skip_plot():
-                self._update_data(**kwargs)
-                self.sig_data_roll_tick.emit(self, self.rolling_index)
+                self._update_data(self.rolling_index, **kwargs)
                 self.rolling_index += len(y)
@@ -0,0 +1,107 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def is_sorted(x: np.ndarray) -> bool:
+    """Return True if x is non-decreasing, NaN values are not sorted"""
+    return x.size < 2 or bool(np.all(x[1:] >= x[:-1]))
+
+
+def _first_index(mask: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Index of first True value of mask in every bin beginning at starts, start of bin is used for bins without any"""
+    result = starts.copy()
+    indexes = np.flatnonzero(mask)
+    if indexes.size > 0:
+        # Matches are sorted, so bins of matches are found by binary search and the first match of bin is kept
+        bins = np.searchsorted(starts, indexes, side="right") - 1
+        first = np.concatenate(([True], bins[1:] != bins[:-1]))
+        result[bins[first]] = indexes[first]
+    return result
+
+
+def m4(x: np.ndarray, y: np.ndarray, bin_width: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    M4 decimation of line with sorted x. Data are split into bins of bin_width (one pixel column),
+    and only first, min, max and last point of every bin is kept.
+    Rendered line is visually identical while number of points is bounded by number of pixel columns.
+    Bin boundaries are found by binary search in sorted x, so per sample work is only min and max reduction.
+    """
+    if x.size < 5 or bin_width <= 0:
+        return x, y
+    bins = int((float(x[-1]) - float(x[0])) // bin_width) + 1
+    if bins > x.size:
+        # Bin of every sample is cheaper than binary search of more edges than samples, narrow integer x could overflow
+        numbers = (np.subtract(x, x[0], dtype=np.float64) // bin_width).astype(np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(numbers)) + 1))
+    else:
+        edges = float(x[0]) + np.arange(1, bins) * bin_width
+        if x.dtype.kind in "iu":
+            # Edges in dtype of x, so x isn't converted by searchsorted, first integer not less than edge is equivalent
+            info = np.iinfo(x.dtype)
+            edges = np.clip(np.ceil(edges), info.min, info.max)
+        starts = np.searchsorted(x, edges.astype(x.dtype), side="left")
+        starts = np.concatenate(([0], starts[starts < x.size]))
+        # Skip empty bins
+        starts = starts[np.concatenate(([True], np.diff(starts) != 0))]
+    if starts.size * 4 >= x.size:
+        # Nothing to gain
+        return x, y
+    counts = np.diff(np.append(starts, x.size))
+    ends = starts + counts - 1
+    # NaN aware min and max of every bin
+    mins = np.fmin.reduceat(y, starts)
+    maxs = np.fmax.reduceat(y, starts)
+    min_index = _first_index(y == np.repeat(mins, counts), starts)
+    max_index = _first_index(y == np.repeat(maxs, counts), starts)
+    indexes = np.sort(np.stack((starts, min_index, max_index, ends), axis=1), axis=1).ravel()
+    indexes = indexes[np.concatenate(([True], np.diff(indexes) != 0))]
+    return x[indexes], y[indexes]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling into given number of points.
+    Data are split into equally sized buckets by index and from every bucket the point forming the largest triangle
+    with the previously selected point and the average of the next bucket is selected.
+    Works for unsorted x as well, so it can be used for scatter plots.
+    """
+    size = x.size
+    if points >= size or points < 3:
+        return x, y
+    xf, yf = x.astype(np.float64, copy=False), y.astype(np.float64, copy=False)
+    # Bucket edges, first and last point are always selected
+    edges = np.linspace(1, size - 1, points - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+    penalty = None
+    nan_points = np.isnan(xf) | np.isnan(yf)
+    if nan_points.any():
+        # NaN points get area of -inf, so they are never selected, unless the whole bucket is NaN
+        xf, yf = np.where(nan_points, 0., xf), np.where(nan_points, 0., yf)
+        penalty = np.where(nan_points, -np.inf, 0.)
+        counts = counts - np.add.reduceat(nan_points[:size - 1], starts)
+    # Averages of every bucket without NaN points, used as third triangle point of the previous bucket
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_x = np.add.reduceat(xf[:size - 1], starts) / counts
+        avg_y = np.add.reduceat(yf[:size - 1], starts) / counts
+    avg_x = np.append(avg_x[1:], xf[-1])
+    avg_y = np.append(avg_y[1:], yf[-1])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    # Doubled area of triangle of previous selection a, point p and average c of the next bucket is
+    # |(ax - cx) * py + (cy - ay) * px + cx * ay - ax * cy|, coefficients are the same for the whole bucket
+    a_x, a_y = float(xf[0]), float(yf[0])
+    for bucket, (start, end, c_x, c_y) in enumerate(zip(starts.tolist(), ends.tolist(),
+                                                        avg_x.tolist(), avg_y.tolist())):
+        areas = (a_x - c_x) * yf[start:end]
+        areas += (c_y - a_y) * xf[start:end]
+        areas += c_x * a_y - a_x * c_y
+        np.abs(areas, out=areas)
+        if penalty is not None:
+            areas += penalty[start:end]
+        a = start + int(areas.argmax())
+        selected[bucket + 1] = a
+        a_x, a_y = float(xf[a]), float(yf[a])
+    return x[selected], y[selected]
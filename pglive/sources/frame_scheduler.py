@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import Dict, Tuple, TYPE_CHECKING
+
+from pyqtgraph.Qt import QtCore  # type: ignore
+
+if TYPE_CHECKING:
+    from pglive.sources.data_connector import DataConnector
+    from pglive.sources.live_plot_widget import LivePlotWidget
+
+
+class FrameScheduler(QtCore.QObject):
+    """
+    Coalesce updates of all DataConnectors plotted in one LivePlotWidget into frames.
+    DataConnectors only mark themselves dirty on new data. Once per frame, data of all dirty connectors
+    are pushed into plots, view range is calculated once and set_range is called at most once.
+    """
+
+    def __init__(self, plot_widget: LivePlotWidget, frame_rate: float = 60.) -> None:
+        """
+        :param plot_widget: LivePlotWidget updated by this scheduler
+        :param float frame_rate: Target frame rate in Hz
+        """
+        super().__init__(plot_widget)
+        self.plot_widget = plot_widget
+        # Dirty connectors with their last roll tick and merged kwargs
+        self._dirty: Dict[DataConnector, Tuple[int, Dict]] = {}
+        self._dirty_lock = Lock()
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.slot_frame)
+        self.frame_rate = frame_rate
+
+    @property
+    def frame_rate(self) -> float:
+        return self._frame_rate
+
+    @frame_rate.setter
+    def frame_rate(self, new_frame_rate: float) -> None:
+        assert new_frame_rate > 0
+        self._frame_rate = new_frame_rate
+        self.timer.start(max(1, int(1000 / new_frame_rate)))
+
+    def stop(self) -> None:
+        """Stop frame timer"""
+        self.timer.stop()
+
+    def mark_dirty(self, data_connector: DataConnector, tick: int, kwargs: Dict) -> None:
+        """Mark DataConnector to be plotted in the next frame, can be called from any thread"""
+        with self._dirty_lock:
+            if data_connector in self._dirty:
+                kwargs = {**self._dirty[data_connector][1], **kwargs}
+            self._dirty[data_connector] = (tick, kwargs)
+
+    def discard(self, data_connector: DataConnector) -> None:
+        """Forget pending update of DataConnector"""
+        with self._dirty_lock:
+            self._dirty.pop(data_connector, None)
+
+    def slot_frame(self) -> None:
+        """Push data of all dirty connectors into plots and update view range once"""
+        with self._dirty_lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, {}
+
+        ticks = {}
+        for data_connector, (tick, kwargs) in dirty.items():
+            with data_connector.data_lock:
+                if len(data_connector.x) == 0:
+                    continue
+                y, x = data_connector._data_arrays()
+            data_connector.slot_new_data(y, x, kwargs)
+            ticks[data_connector] = tick
+        self.plot_widget.slot_roll_ticks(ticks)
@@ -0,0 +1,144 @@
+import glob
+import os
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Optional, Tuple, Literal
+
+import numpy as np
+
+from pglive.sources.decimation import m4
+from pglive.sources.ring_buffer import _as_1d_array
+
+
+class HistoryStore:
+    """
+    Append-only history of x and y data in chunked, memory-mapped .npy files on local disk.
+    Every chunk holds chunk_size samples of one axis, number of stored samples is kept in memory-mapped length.npy,
+    which is updated only after data are written, so the store is consistent even if the process crashes.
+    Data are never loaded as a whole, reads return np.memmap slices, so only touched pages are resident.
+    Reopening an existing store reads only .npy headers.
+    """
+
+    def __init__(self, path: str, dtype: Any = np.float64, chunk_size: int = 2 ** 20,
+                 x_dtype: Optional[Any] = None) -> None:
+        """
+        :param str path: Directory of the store, created if it doesn't exist
+        :param dtype: NumPy dtype of y of a new store, existing store keeps its dtype
+        :param int chunk_size: Number of samples in one chunk file of a new store, existing store keeps its chunk size
+        :param x_dtype: NumPy dtype of x of a new store, same as dtype if None, existing store keeps its dtype
+        """
+        assert chunk_size > 0
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._chunks: Dict[Tuple[str, int], np.memmap] = {}
+        # Incremented whenever stored data are replaced or removed, appends don't change samples already stored
+        self.generation = 0
+        length_path = os.path.join(path, "length.npy")
+        if os.path.exists(length_path):
+            self._length = np.load(length_path, mmap_mode="r+")
+        else:
+            self._length = np.lib.format.open_memmap(length_path, mode="w+", dtype=np.int64, shape=(1,))
+        existing = sorted(glob.glob(os.path.join(path, "y_*.npy")))
+        if existing:
+            first = np.load(existing[0], mmap_mode="r")
+            first_x = np.load(os.path.join(path, "x" + os.path.basename(existing[0])[1:]), mmap_mode="r")
+            self.dtype, self.x_dtype, self.chunk_size = first.dtype, first_x.dtype, first.shape[0]
+        else:
+            self.dtype, self.chunk_size = np.dtype(dtype), chunk_size
+            self.x_dtype = self.dtype if x_dtype is None else np.dtype(x_dtype)
+
+    def __len__(self) -> int:
+        return int(self._length[0])
+
+    def _chunk(self, axis: str, index: int) -> np.memmap:
+        """Return memory-mapped chunk of axis, chunk file is created if it doesn't exist"""
+        chunk = self._chunks.get((axis, index))
+        if chunk is None:
+            chunk_path = os.path.join(self.path, f"{axis}_{index:06d}.npy")
+            if os.path.exists(chunk_path):
+                chunk = np.load(chunk_path, mmap_mode="r+")
+            else:
+                dtype = self.x_dtype if axis == "x" else self.dtype
+                chunk = np.lib.format.open_memmap(chunk_path, mode="w+", dtype=dtype, shape=(self.chunk_size,))
+            self._chunks[(axis, index)] = chunk
+        return chunk
+
+    def append(self, y: Any, x: Any) -> None:
+        self.extend((y,), (x,))
+
+    def extend(self, y: Any, x: Any) -> None:
+        """Append data, y and x must have the same length"""
+        y, x = _as_1d_array(y), _as_1d_array(x)
+        assert y.size == x.size
+        position, written = len(self), 0
+        while written < y.size:
+            index, offset = divmod(position + written, self.chunk_size)
+            count = min(self.chunk_size - offset, y.size - written)
+            self._chunk("y", index)[offset:offset + count] = y[written:written + count]
+            self._chunk("x", index)[offset:offset + count] = x[written:written + count]
+            written += count
+        # Length is updated as the last one, so partially written data are never visible
+        self._length[0] = position + y.size
+
+    def replace(self, y: Any, x: Any) -> None:
+        """Replace all stored data"""
+        self.generation += 1
+        self._length[0] = 0
+        self.extend(y, x)
+
+    def clear(self) -> None:
+        """Remove all stored data and their chunk files"""
+        self.generation += 1
+        self._length[0] = 0
+        self._chunks.clear()
+        for chunk_path in glob.glob(os.path.join(self.path, "[xy]_*.npy")):
+            os.remove(chunk_path)
+
+    def flush(self) -> None:
+        """Write all changes to disk"""
+        self._length.flush()
+        for chunk in self._chunks.values():
+            chunk.flush()
+
+    def read(self, start: int, stop: int, bin_width: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return y and x of samples [start, stop), slices of one chunk are returned as memmap views without copy.
+        With bin_width, slice of every chunk is reduced by M4 decimation before slices are joined,
+        so only one chunk is processed at once and joined data are bounded by number of bins.
+        """
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return np.empty(0, self.dtype), np.empty(0, self.x_dtype)
+        first, last = start // self.chunk_size, (stop - 1) // self.chunk_size
+        ys, xs = [], []
+        for index in range(first, last + 1):
+            chunk_start = index * self.chunk_size
+            begin, end = max(start - chunk_start, 0), min(stop - chunk_start, self.chunk_size)
+            y, x = self._chunk("y", index)[begin:end], self._chunk("x", index)[begin:end]
+            if bin_width is not None:
+                x, y = m4(x, y, bin_width)
+            ys.append(y)
+            xs.append(x)
+        if len(ys) == 1:
+            return ys[0], xs[0]
+        return np.concatenate(ys), np.concatenate(xs)
+
+    def search(self, x_min: float, x_max: float) -> Tuple[int, int]:
+        """
+        Return range of samples with sorted x in [x_min, x_max], extended by one sample on both sides.
+        Only first x of chunks and a few pages of searched chunks are read.
+        """
+        length = len(self)
+        if length == 0:
+            return 0, 0
+        chunks = (length - 1) // self.chunk_size + 1
+        first_x = [self._chunk("x", index)[0] for index in range(chunks)]
+        return (max(self._search(first_x, x_min, length, "left") - 1, 0),
+                min(self._search(first_x, x_max, length, "right") + 1, length))
+
+    def _search(self, first_x: list, value: float, length: int, side: Literal["left", "right"]) -> int:
+        """Find position of value in x, first chunk is found by its first x and then searched by searchsorted"""
+        # Last chunk starting before value, or at value if searching from right
+        index = max((bisect_left if side == "left" else bisect_right)(first_x, value) - 1, 0)
+        chunk_start = index * self.chunk_size
+        chunk = self._chunk("x", index)[:min(length - chunk_start, self.chunk_size)]
+        return chunk_start + int(np.searchsorted(chunk, value, side))
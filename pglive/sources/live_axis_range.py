@@ -1,7 +1,78 @@
+import heapq
+import math
 import numbers
 import time
 from copy import copy
-from typing import Optional, List, Tuple, Dict
+from typing import Any, Optional, List, Tuple, Dict, Iterable, Set
+
+
+class _RangeAggregate:
+    """
+    Union of ranges of many connectors, maintained incrementally by min-heap of range starts
+    and max-heap of range ends. Replaced and removed ranges are removed from heaps lazily,
+    so updating one range and querying the union are O(log N) amortised.
+    """
+
+    def __init__(self) -> None:
+        self.ranges: Dict[int, Tuple[float, float]] = {}
+        # Heap entries are (value, version, key), entry is valid only if its version is the current version of key
+        self._versions: Dict[int, int] = {}
+        self._version = 0
+        self._lower: List[Tuple[float, int, int]] = []
+        self._upper: List[Tuple[float, int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def set(self, key: int, axis_range: List[float]) -> None:
+        """Set range of key, heaps are updated only if range changed"""
+        new_range = (axis_range[0], axis_range[1])
+        if self.ranges.get(key) == new_range:
+            return
+        self.ranges[key] = new_range
+        self._version += 1
+        self._versions[key] = self._version
+        # NaN bounds don't extend the union
+        if not math.isnan(new_range[0]):
+            heapq.heappush(self._lower, (new_range[0], self._version, key))
+        if not math.isnan(new_range[1]):
+            heapq.heappush(self._upper, (-new_range[1], self._version, key))
+        if len(self._lower) + len(self._upper) > 4 * len(self.ranges) + 64:
+            self._rebuild()
+
+    def discard(self, key: int) -> None:
+        self.ranges.pop(key, None)
+        self._versions.pop(key, None)
+
+    def _rebuild(self) -> None:
+        """Drop all stale heap entries"""
+        self._lower = [entry for entry in self._lower if self._versions.get(entry[2]) == entry[1]]
+        self._upper = [entry for entry in self._upper if self._versions.get(entry[2]) == entry[1]]
+        heapq.heapify(self._lower)
+        heapq.heapify(self._upper)
+
+    def _top(self, heap: List[Tuple[float, int, int]]) -> Optional[float]:
+        while heap and self._versions.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def bounds(self) -> Optional[List[float]]:
+        """Return union of all ranges, None if there are no ranges"""
+        if not self.ranges:
+            return None
+        lower, upper = self._top(self._lower), self._top(self._upper)
+        return [math.nan if lower is None else lower, math.nan if upper is None else -upper]
+
+
+def _nice_range(lower: float, upper: float) -> List[float]:
+    """Extend range to multiples of nice step (1, 2 or 5 times power of ten), about ten steps per range"""
+    width = upper - lower
+    if not width > 0 or math.isinf(width):
+        return [lower, upper]
+    raw_step = width / 10
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(multiple * magnitude for multiple in (1, 2, 5, 10) if multiple * magnitude >= raw_step)
+    return [math.floor(lower / step) * step, math.ceil(upper / step) * step]
 
 
 class LiveAxisRange:
@@ -17,6 +88,13 @@ class LiveAxisRange:
         x_range_limit: Optional[List[float]] = None,
         y_min_range_width: Optional[float] = None,
         y_range_limit: Optional[List[float]] = None,
+        fit_visible: bool = False,
+        y_shrink_ratio: Optional[float] = None,
+        y_shrink_delay: float = 0.0,
+        y_nice_range: bool = False,
+        quantile_range: bool = False,
+        time_window: Optional[float] = None,
+        crop_to_time_window: bool = False,
     ) -> None:
         self.roll_on_tick = roll_on_tick
         self.offset_left = offset_left
@@ -32,16 +110,63 @@ class LiveAxisRange:
         self.x_range_limit = x_range_limit
         self.y_min_range_width = y_min_range_width
         self.y_range_limit = y_range_limit
-        self.x_range: Dict[str, List[float]] = {}
-        self.y_range: Dict[str, List[float]] = {}
+        # Fit y range to data visible in x range, when view is zoomed or panned manually
+        self.fit_visible = fit_visible
+        # Y range hysteresis, range expands immediately, but shrinks only once data use less than
+        # y_shrink_ratio of it for y_shrink_delay seconds. With y_nice_range, range is snapped to nice values
+        assert y_shrink_ratio is None or 0 < y_shrink_ratio <= 1
+        self.y_shrink_ratio = y_shrink_ratio
+        self.y_shrink_delay = y_shrink_delay
+        self.y_nice_range = y_nice_range
+        self._held_y_range: Optional[List[float]] = None
+        self._y_shrink_since: Optional[float] = None
+        # Use streaming quantiles of DataConnector instead of data bounds, so single outliers don't blow up range
+        self.quantile_range = quantile_range
+        # X range shows last time_window of data, its start is found by binary search in sorted x.
+        # offset_left and offset_right extend the window in units of x, fixed_range takes precedence.
+        # With crop_to_time_window only data inside time window are passed to plots
+        assert time_window is None or time_window > 0
+        self.time_window = time_window
+        self.crop_to_time_window = crop_to_time_window
+        self.x_range: Dict[int, List[float]] = {}
+        self.y_range: Dict[int, List[float]] = {}
         self.final_x_range = [0.0, 0.0]
         self.final_y_range = [0.0, 0.0]
-        self.ignored_data_connectors: List[str] = []
+        self.ignored_data_connectors: Set[int] = set()
+        # Union of ranges of all not ignored connectors
+        self._x_aggregate = _RangeAggregate()
+        self._y_aggregate = _RangeAggregate()
+
+    def _merge(self, aggregate: _RangeAggregate, data_connector, final_range: List[float]) -> List[float]:
+        """Store range of data_connector and extend final_range by ranges of all not ignored connectors"""
+        connector_id = data_connector.__hash__()
+        if connector_id not in self.ignored_data_connectors:
+            aggregate.set(connector_id, final_range)
+        union = aggregate.bounds()
+        if union is not None:
+            if final_range[0] > union[0]:
+                final_range[0] = union[0]
+            if final_range[1] < union[1]:
+                final_range[1] = union[1]
+        return final_range
+
+    def _union(self, aggregate: _RangeAggregate) -> List[float]:
+        """Union of ranges of all not ignored connectors"""
+        final_range = aggregate.bounds()
+        return [0, 0] if final_range is None else final_range
 
     def get_x_range(self, data_connector, tick: int) -> List[float]:
         x, _ = data_connector.plot.getData()
         if x is None:
             return [0.0]
+        # Plots without connector x on x axis don't support time window
+        time_window = getattr(data_connector.plot, "time_window", lambda: None)()
+        if time_window is not None and self.fixed_range is None and len(x) > 0 and isinstance(x[-1], numbers.Real):
+            # Window ending with the last sample, extended by offsets in units of x
+            x_last = float(x[-1])
+            return self._set_x_range(data_connector, x, [x_last - time_window - self.offset_left,
+                                                         x_last + self.offset_right])
+        axis_range: Any
         if tick == 0:
             if isinstance(x[0], numbers.Number):
                 axis_range = [x[0], x[0]]
@@ -53,10 +178,17 @@ class LiveAxisRange:
             else:
                 axis_range = [0, data_connector.plot.data_tick(ax=0) * 2]
         else:
-            axis_range = data_connector.plot.data_bounds(ax=0, offset=self.roll_on_tick if self.roll_on_tick > 1 else 0)
+            axis_range = self._quantile_bounds(data_connector, ax=0)
+            if axis_range is None:
+                axis_range = data_connector.plot.data_bounds(ax=0,
+                                                             offset=self.roll_on_tick if self.roll_on_tick > 1 else 0)
         final_range = self._get_range(axis_range, tick, (self.offset_left, self.offset_right))
         if final_range is None:
             return self.final_x_range
+        return self._set_x_range(data_connector, x, final_range)
+
+    def _set_x_range(self, data_connector, x: Any, final_range: List[float]) -> List[float]:
+        """Offset final_range by plot position, store it and merge it with ranges of other connectors"""
         offset_x = data_connector.plot.pos().x()
         final_range[0] += offset_x
         final_range[1] += offset_x
@@ -66,43 +198,15 @@ class LiveAxisRange:
         if self.crop_right_offset_to_data and final_range[1] > x[-1]:
             final_range[1] = x[-1]
         self.x_range[data_connector.__hash__()] = copy(final_range)
-        for connector_id, x_range in self.x_range.items():
-            if connector_id in self.ignored_data_connectors:
-                continue
-            if final_range[0] > x_range[0]:
-                final_range[0] = x_range[0]
-            if final_range[1] < x_range[1]:
-                final_range[1] = x_range[1]
-        if final_range[0] == final_range[1] and self.x_min_range_width is not None:
-            # Pyqtgraph ViewBox.setRange doesn't like same value for min and max,
-            # therefore in that case we must set some range
-            final_range[0] -= 0.4
-            final_range[1] += 0.4
-        final_range = self._update_range_width(self.x_range_limit, self.x_min_range_width, final_range)
+        final_range = self._merge(self._x_aggregate, data_connector, final_range)
+        final_range = self._limit_range(final_range, 0)
         if self.final_x_range != final_range:
             self.final_x_range = final_range
         return self.final_x_range
 
     def recalculate_x_range(self):
-        final_range = None
-        for connector_id, x_range in self.x_range.items():
-            if connector_id in self.ignored_data_connectors:
-                continue
-            elif final_range is None:
-                final_range = copy(x_range)
-                continue
-            if final_range[0] > x_range[0]:
-                final_range[0] = x_range[0]
-            if final_range[1] < x_range[1]:
-                final_range[1] = x_range[1]
-        if final_range is None:
-            final_range = [0, 0]
-        if final_range[0] == final_range[1] and self.x_min_range_width is not None:
-            # Pyqtgraph ViewBox.setRange doesn't like same value for min and max,
-            # therefore in that case we must set some range
-            final_range[0] -= 0.4
-            final_range[1] += 0.4
-        final_range = self._update_range_width(self.x_range_limit, self.x_min_range_width, final_range)
+        final_range = self._union(self._x_aggregate)
+        final_range = self._limit_range(final_range, 0)
         if self.final_x_range != final_range:
             self.final_x_range = final_range
         return self.final_x_range
@@ -111,6 +215,7 @@ class LiveAxisRange:
         _, y = data_connector.plot.getData()
         if y is None:
             return [0.0]
+        axis_range: Any
         if tick == 0:
             if isinstance(y[0], numbers.Number):
                 axis_range = [y[0], y[0]]
@@ -122,7 +227,10 @@ class LiveAxisRange:
             else:
                 axis_range = [0, data_connector.plot.data_tick(ax=1) * 2]
         else:
-            axis_range = data_connector.plot.data_bounds(ax=1, offset=self.roll_on_tick if self.roll_on_tick > 1 else 0)
+            axis_range = self._quantile_bounds(data_connector, ax=1)
+            if axis_range is None:
+                axis_range = data_connector.plot.data_bounds(ax=1,
+                                                             offset=self.roll_on_tick if self.roll_on_tick > 1 else 0)
         final_range = self._get_range(axis_range, tick, (self.offset_bottom, self.offset_top))
         if final_range is None:
             return self.final_y_range
@@ -135,46 +243,49 @@ class LiveAxisRange:
         if self.crop_top_offset_to_data and final_range[1] > y[-1]:
             final_range[1] = y[-1]
         self.y_range[data_connector.__hash__()] = copy(final_range)
-        for connector_id, y_range in self.y_range.items():
-            if connector_id in self.ignored_data_connectors:
-                continue
-            if final_range[0] > y_range[0]:
-                final_range[0] = y_range[0]
-            if final_range[1] < y_range[1]:
-                final_range[1] = y_range[1]
-        if final_range[0] == final_range[1] and self.y_min_range_width is None:
-            # Pyqtgraph ViewBox.setRange doesn't like same value for min and max,
-            # therefore in that case we must set some range
-            final_range[0] -= 0.4
-            final_range[1] += 0.4
-        final_range = self._update_range_width(self.y_range_limit, self.y_min_range_width, final_range)
+        final_range = self._merge(self._y_aggregate, data_connector, final_range)
+        final_range = self._limit_range(final_range, 1)
+        final_range = self._hold_y_range(final_range)
         if self.final_y_range != final_range:
             self.final_y_range = final_range
         return self.final_y_range
 
     def recalculate_y_range(self):
+        final_range = self._union(self._y_aggregate)
+        final_range = self._limit_range(final_range, 1)
+        final_range = self._hold_y_range(final_range)
+        if self.final_y_range != final_range:
+            self.final_y_range = final_range
+        return self.final_y_range
+
+    def get_visible_y_range(self, data_connectors: Iterable, x_range: List[float]) -> Optional[List[float]]:
+        """Calculate y range of data visible in x_range, None if there are no visible data"""
         final_range = None
-        for connector_id, y_range in self.y_range.items():
-            if connector_id in self.ignored_data_connectors:
+        for data_connector in data_connectors:
+            plot = data_connector.plot
+            if (data_connector.__hash__() in self.ignored_data_connectors or data_connector.ignore_auto_range
+                    or not plot.isVisible() or not hasattr(plot, "visible_bounds")):
                 continue
-            elif final_range is None:
-                final_range = copy(y_range)
+            offset_x, offset_y = plot.pos().x(), plot.pos().y()
+            y_min, y_max = plot.visible_bounds(x_range[0] - offset_x, x_range[1] - offset_x)
+            if math.isnan(y_min):
                 continue
-            if final_range[0] > y_range[0]:
-                final_range[0] = y_range[0]
-            if final_range[1] < y_range[1]:
-                final_range[1] = y_range[1]
+            if final_range is None:
+                final_range = [y_min + offset_y, y_max + offset_y]
+            else:
+                final_range = [min(final_range[0], y_min + offset_y), max(final_range[1], y_max + offset_y)]
         if final_range is None:
-            final_range = [0, 0]
-        if final_range[0] == final_range[1] and self.y_min_range_width is None:
-            # Pyqtgraph ViewBox.setRange doesn't like same value for min and max,
-            # therefore in that case we must set some range
-            final_range[0] -= 0.4
-            final_range[1] += 0.4
-        final_range = self._update_range_width(self.y_range_limit, self.y_min_range_width, final_range)
-        if self.final_y_range != final_range:
-            self.final_y_range = final_range
-        return self.final_y_range
+            return None
+        return self._limit_range(final_range, 1)
+
+    def _quantile_bounds(self, data_connector, ax: int) -> Optional[Tuple[float, float]]:
+        """Quantiles of data of ax maintained by DataConnector, None if they are not used or not available"""
+        if not self.quantile_range or not hasattr(data_connector.plot, "quantile_bounds"):
+            return None
+        bounds = data_connector.plot.quantile_bounds(ax)
+        if bounds is None or math.isnan(bounds[0]):
+            return None
+        return bounds
 
     def _get_range(
         self, axis_range: Tuple[float, float], tick: int, offsets: Tuple[float, float]
@@ -211,7 +322,56 @@ class LiveAxisRange:
         else:
             return None
 
-    def _update_range_width(self, bound, range_width, final_range):
+    def _hold_y_range(self, final_range: List[float]) -> List[float]:
+        """Apply y range hysteresis and snapping, so view range doesn't change on every small change of data"""
+        if self.y_shrink_ratio is None and not self.y_nice_range or self.fixed_range is not None:
+            return final_range
+        if math.isnan(final_range[0]) or math.isnan(final_range[1]):
+            return final_range
+        held = self._held_y_range
+        if held is None or final_range[0] < held[0] or final_range[1] > held[1]:
+            # Data left the view, expand immediately
+            if held is not None and self.y_shrink_ratio is not None:
+                final_range = [min(final_range[0], held[0]), max(final_range[1], held[1])]
+            self._y_shrink_since = None
+        elif (self.y_shrink_ratio is not None
+              and final_range[1] - final_range[0] < self.y_shrink_ratio * (held[1] - held[0])):
+            # Data use only small part of the view, shrink once it lasts y_shrink_delay
+            now = time.perf_counter()
+            if self._y_shrink_since is None:
+                self._y_shrink_since = now
+            if now - self._y_shrink_since < self.y_shrink_delay:
+                return copy(held)
+            self._y_shrink_since = None
+        else:
+            self._y_shrink_since = None
+            if self.y_shrink_ratio is not None or _nice_range(*final_range) == held:
+                return copy(held)
+        if self.y_nice_range:
+            final_range = _nice_range(*final_range)
+            if self.y_range_limit is not None:
+                final_range = [max(final_range[0], self.y_range_limit[0]), min(final_range[1], self.y_range_limit[1])]
+        self._held_y_range = copy(final_range)
+        return final_range
+
+    def _limit_range(self, final_range: List[float], ax: int) -> List[float]:
+        """Pad range of the same min and max and apply range limit and minimal range width of x (ax=0) or y (ax=1)"""
+        if ax == 0:
+            bound, range_width = self.x_range_limit, self.x_min_range_width
+            # x range is padded only if minimal width is set, y range only if it isn't
+            pad = range_width is not None
+        else:
+            bound, range_width = self.y_range_limit, self.y_min_range_width
+            pad = range_width is None
+        if pad and final_range[0] == final_range[1]:
+            # Pyqtgraph ViewBox.setRange doesn't like same value for min and max,
+            # therefore in that case we must set some range
+            final_range[0] -= 0.4
+            final_range[1] += 0.4
+        return self._update_range_width(bound, range_width, final_range)
+
+    def _update_range_width(self, bound: Optional[List[float]], range_width: Optional[float],
+                            final_range: List[float]) -> List[float]:
         if range_width is not None:
             if abs(final_range[0] - final_range[1]) < range_width:
                 center_pt = (final_range[0] + final_range[1]) / 2
@@ -232,10 +392,17 @@ class LiveAxisRange:
         return final_range
 
     def ignore_connector(self, data_connector, flag: bool) -> None:
+        connector_id = data_connector.__hash__()
         if not flag:
-            self.ignored_data_connectors.append(data_connector.__hash__())
+            self.ignored_data_connectors.add(connector_id)
+            self._x_aggregate.discard(connector_id)
+            self._y_aggregate.discard(connector_id)
         else:
-            self.ignored_data_connectors.remove(data_connector.__hash__())
+            self.ignored_data_connectors.discard(connector_id)
+            if connector_id in self.x_range:
+                self._x_aggregate.set(connector_id, self.x_range[connector_id])
+            if connector_id in self.y_range:
+                self._y_aggregate.set(connector_id, self.y_range[connector_id])
         try:
             self.get_x_range(data_connector, data_connector.rolling_index)
         except TypeError:
@@ -246,9 +413,9 @@ class LiveAxisRange:
             return None
 
     def remove_data_connector(self, data_connector):
-        if data_connector.__hash__() in self.ignored_data_connectors:
-            self.ignored_data_connectors.remove(data_connector.__hash__())
-        if data_connector.__hash__() in self.y_range:
-            del self.y_range[data_connector.__hash__()]
-        if data_connector.__hash__() in self.x_range:
-            del self.x_range[data_connector.__hash__()]
+        connector_id = data_connector.__hash__()
+        self.ignored_data_connectors.discard(connector_id)
+        self.x_range.pop(connector_id, None)
+        self.y_range.pop(connector_id, None)
+        self._x_aggregate.discard(connector_id)
+        self._y_aggregate.discard(connector_id)
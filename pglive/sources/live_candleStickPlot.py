@@ -89,10 +89,15 @@ class LiveCandleStickPlot(pg.GraphicsObject, MixinLivePlot, MixinLeadingLine):
     def data_bounds(self, ax: int = 0, offset: int = 0) -> Tuple[ndarray, ndarray]:
         if self.x_data is [] and self.output_y_data is []:
             return 0, 0
+        x_data, output_y_data = self.x_data, self.output_y_data
+        if self.time_window() is not None and len(x_data) > 0:
+            # Only candles inside time window are visible
+            start = self.time_window_start(x_data)
+            x_data, output_y_data = x_data[start:], output_y_data[start * 2:]
         if ax == 0:
-            sub_range = self.x_data[-offset:]
+            sub_range = x_data[-offset:]
         else:
-            sub_range = self.output_y_data[-offset * 2:]
+            sub_range = output_y_data[-offset * 2:]
         return np.nanmin(sub_range), np.nanmax(sub_range)
 
     def data_tick(self, ax: int = 0):
@@ -118,6 +118,7 @@ class LiveCategorizedBarPlot(pg.GraphicsObject, MixinLivePlot, MixinLeadingLine)
             sub_range = self.x_data[-offset:]
             return np.nanmin(sub_range), np.nanmax(sub_range)
         else:
+            # Rows of all categories are shown, so y range doesn't depend on samples inside time window
             h = self.bar_height / 2
             return 0 - h, len(self.categories) - (1 - h)
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Union, Optional, Protocol, Dict, Any, TYPE_CHECKING
+from typing import Union, Optional, Protocol, Dict, Any, Tuple, TYPE_CHECKING
 
+import numpy as np
 import pyqtgraph as pg  # type: ignore
 from pyqtgraph.Qt import QtGui, QtCore  # type: ignore
 
-from pglive.kwargs import LeadingLine, Orientation
+from pglive.kwargs import LeadingLine, Orientation, Decimation
+from pglive.sources.decimation import m4, lttb, is_sorted
 from pglive.sources.live_plot_widget import LivePlotWidget
 from pglive.sources.utils import NUM_LIST
 
@@ -19,20 +21,261 @@ if TYPE_CHECKING:
 
         def getViewBox(self) -> pg.ViewBox: ...
 
+        def getData(self) -> Tuple[Any, Any]: ...
+
         def setVisible(self, flag: bool) -> None: ...
 
+        def isVisible(self) -> bool: ...
+
+        def clear(self) -> None: ...
+
 else:
     class SupportsLivePlot:
         ...
 
 
-class MixinLivePlot(SupportsLivePlot):
+class MixinTimeWindow(SupportsLivePlot):
+    """Implements time window of x range controller and bounds maintained by DataConnector, shared by all live plots"""
+    plot_widget: Optional[LivePlotWidget] = None
+
+    def time_window(self) -> Optional[float]:
+        """Time window of x range controller, None if x range isn't time window"""
+        return getattr(getattr(self.plot_widget, "x_range_controller", None), "time_window", None)
+
+    def time_window_start(self, x: Any) -> int:
+        """Index of the first sample of sorted x inside time window ending with the last sample"""
+        return int(np.searchsorted(x, x[-1] - self.time_window(), side="left"))
+
+    def _crop_to_time_window(self) -> bool:
+        """Plot only data inside time window, unless view is zoomed or panned manually"""
+        if self.plot_widget is None or self.time_window() is None:
+            return False
+        return self.plot_widget.x_range_controller.crop_to_time_window and not self.plot_widget.manual_range
+
+    def _time_window_bounds(self, data_connector: Any, ax: int) -> Optional[Tuple[Any, Any]]:
+        """Bounds inside time window, y is found by binary search in range index, None without range index"""
+        time_window = self.time_window()
+        if time_window is None or data_connector.y_index is None or len(data_connector.x) == 0:
+            return None
+        x_min, x_max = data_connector.x[-1] - time_window, data_connector.x[-1]
+        return (x_min, x_max) if ax == 0 else data_connector.visible_bounds(x_min, x_max)
+
+    def tracked_bounds(self, ax: int = 0, offset: int = 0) -> Optional[Tuple[Any, Any]]:
+        """Bounds of last offset samples maintained by DataConnector, None if DataConnector doesn't track them"""
+        data_connector = getattr(self, "data_connector", None)
+        if data_connector is None:
+            return None
+        if self.time_window() is not None:
+            return self._time_window_bounds(data_connector, ax)
+        if offset == 0 and data_connector.bounds is not None:
+            return data_connector.bounds[ax]
+        if data_connector.x_index is not None:
+            return data_connector.tail_bounds(ax, offset)
+        return None
+
+    def quantile_bounds(self, ax: int = 0) -> Optional[Tuple[Any, Any]]:
+        """Low and high quantile of y maintained by DataConnector, None for x or if DataConnector doesn't track them"""
+        y_quantiles = getattr(getattr(self, "data_connector", None), "y_quantiles", None)
+        if ax == 0 or y_quantiles is None or self.time_window() is not None:
+            # Quantiles of all stored data don't fit data in time window
+            return None
+        return y_quantiles.bounds()
+
+
+class MixinLivePlot(MixinTimeWindow):
     """Implements new_data slot for any plot"""
     plot_widget: Optional[LivePlotWidget] = None
     min_x, min_y, max_x, max_y = 0, 0, 0, 0
+    # Full resolution data (y, x, kwargs), kept only if plotted data are decimated
+    _raw_data: Optional[Tuple[Any, Any, Dict]] = None
+    # Decimation bin width in view coordinates and ViewBox connected to decimation
+    _decimation_bin_width: float = 0.
+    _decimation_view_box: Optional[pg.ViewBox] = None
+    # Kwargs of last data plotted from level of detail pyramid
+    _lod_kwargs: Optional[Dict] = None
+    # Last history read as (generation, start, stop, bin_width) and its data
+    _history_cache: Optional[Tuple[Tuple[int, int, int, float], Tuple[np.ndarray, np.ndarray]]] = None
+    # Margin around visible x range kept when data are culled, as a fraction of visible range width
+    cull_margin: float = 0.5
+    # X range of data plotted in manually zoomed or panned view, None if data aren't culled
+    _culled_range: Optional[Tuple[float, float]] = None
 
-    def slot_new_data(self, y: NUM_LIST, x: NUM_LIST, kwargs: Dict) -> None:
-        self.setData(x, y, **kwargs)
+    def slot_new_data(self, y: Union[NUM_LIST, np.ndarray], x: Union[NUM_LIST, np.ndarray], kwargs: Dict) -> None:
+        data_connector = getattr(self, "data_connector", None)
+        if data_connector is not None and data_connector.lod is not None:
+            # Plot only visible part of the history in resolution of plot width
+            self._lod_kwargs = kwargs
+            self.setData(*self.lod_data(), **kwargs)
+            return
+        if self._crop_to_time_window() and isinstance(x, np.ndarray) and isinstance(y, np.ndarray) and x.size > 0:
+            # Only data inside time window are visible
+            start = self.time_window_start(x)
+            x, y = x[start:], y[start:]
+        has_history = data_connector is not None and data_connector.history is not None
+        history = self.history_data() if has_history else None
+        if history is not None:
+            # Manually zoomed or panned view shows data older than the live window
+            self.setData(*history, **kwargs)
+        elif data_connector is not None and data_connector.decimation is not None:
+            raw_data = (y, x, kwargs)
+            x, y = self.decimate(*self.cull(x, y), data_connector.decimation, data_connector.decimation_points)
+            self.setData(x, y, **kwargs)
+            # Some plots are calling clear in setData, so raw data must be stored afterwards
+            self._raw_data = raw_data
+            return
+        else:
+            self.setData(*self.cull(x, y), **kwargs)
+        # Live data of history connector and culled data are kept, so they can be plotted again once the view changes
+        self._raw_data = (y, x, kwargs) if has_history or self._culled_range is not None else None
+
+    def full_data(self) -> Tuple[Any, Any]:
+        """Return plotted data before decimation"""
+        if self._raw_data is not None:
+            y, x, _ = self._raw_data
+            return x, y
+        return self.getData()
+
+    def lod_data(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Query level of detail pyramid of DataConnector for data visible in the view"""
+        lod = getattr(self, "data_connector").lod
+        self._decimation_bin()
+        view_box = self.getViewBox()
+        pixels = int(view_box.width()) if view_box is not None else 0
+        if self.plot_widget is not None and self.plot_widget.manual_range:
+            x_min, x_max = view_box.viewRange()[0]
+        else:
+            # Whole history is displayed in auto range
+            x_min, x_max = -np.inf, np.inf
+        return lod.query(x_min, x_max, pixels)
+
+    def history_data(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Read data visible in manually zoomed or panned view from history store of DataConnector.
+        Every chunk is reduced to pixel resolution while it's read and the result is reused until the view
+        or visible samples change. Return None if view doesn't reach before the live window.
+        """
+        data_connector = getattr(self, "data_connector")
+        # Connect view changes, so history is read again when view is zoomed or panned
+        bin_width = self._decimation_bin()
+        if bin_width is None or self.plot_widget is None or not self.plot_widget.manual_range:
+            return None
+        x_min, x_max = self.getViewBox().viewRange()[0]
+        if len(data_connector.x) == 0 or x_min >= data_connector.x[0]:
+            return None
+        history = data_connector.history
+        start, stop = history.search(x_min, x_max)
+        key = (history.generation, start, stop, bin_width)
+        if self._history_cache is not None and self._history_cache[0] == key:
+            return self._history_cache[1]
+        y, x = history.read(start, stop, bin_width)
+        if data_connector.decimation is not None:
+            x, y = self.decimate(x, y, data_connector.decimation, data_connector.decimation_points)
+        self._history_cache = (key, (x, y))
+        return x, y
+
+    def cull(self, x: Any, y: Any) -> Tuple[Any, Any]:
+        """
+        Slice sorted data to x range of manually zoomed or panned view, extended by cull_margin on both sides.
+        Slice is found by binary search, data are returned unchanged in auto range.
+        """
+        self._culled_range = None
+        if (self.plot_widget is None or not self.plot_widget.manual_range or not isinstance(x, np.ndarray)
+                or not isinstance(y, np.ndarray) or y.ndim != 1 or x.size < 2):
+            return x, y
+        # Connect view changes, so data are culled again when view leaves culled range
+        if self._decimation_bin() is None or not self._x_sorted(x):
+            return x, y
+        x_min, x_max = self.getViewBox().viewRange()[0]
+        margin = (x_max - x_min) * self.cull_margin
+        x_min, x_max = x_min - margin, x_max + margin
+        # One sample on both sides outside of the range, so line continues to the view border
+        start = max(int(np.searchsorted(x, x_min, side="left")) - 1, 0)
+        stop = min(int(np.searchsorted(x, x_max, side="right")) + 1, x.size)
+        if start == 0 and stop == x.size:
+            return x, y
+        self._culled_range = (x_min, x_max)
+        return x[start:stop], y[start:stop]
+
+    def _x_sorted(self, x: np.ndarray) -> bool:
+        """Sortedness of x tracked by DataConnector when data are written, x is scanned only without connector"""
+        x_sorted = getattr(getattr(self, "data_connector", None), "x_sorted", None)
+        return is_sorted(x) if x_sorted is None else x_sorted
+
+    def _decimation_bin(self) -> Optional[float]:
+        """Width of one pixel column in view coordinates"""
+        view_box = self.getViewBox()
+        if view_box is None or view_box.width() <= 0:
+            return None
+        if self._decimation_view_box is not view_box:
+            # Decimate again when plot is zoomed or resized
+            view_box.sigXRangeChanged.connect(self.slot_decimation_view_changed)
+            view_box.sigResized.connect(self.slot_decimation_view_changed)
+            self._decimation_view_box = view_box
+        x_range = view_box.viewRange()[0]
+        return (x_range[1] - x_range[0]) / view_box.width()
+
+    def decimate(self, x: Any, y: Any, method: str, points: Optional[int] = None) -> Tuple[Any, Any]:
+        """
+        Reduce data to the pixel resolution of ViewBox.
+        LTTB reduces data into fixed number of points if set, otherwise into one point per pixel column.
+        """
+        if not isinstance(x, np.ndarray) or not isinstance(y, np.ndarray) or y.ndim != 1 or x.size == 0:
+            return x, y
+        if method == Decimation.LTTB and points is not None:
+            return lttb(x, y, points)
+        bin_width = self._decimation_bin()
+        if bin_width is None:
+            return x, y
+        self._decimation_bin_width = bin_width
+        if method == Decimation.M4 and self._x_sorted(x):
+            return m4(x, y, bin_width)
+        elif method == Decimation.LTTB and bin_width > 0:
+            x_min, x_max = np.nanmin(x), np.nanmax(x)
+            return lttb(x, y, int((x_max - x_min) / bin_width) + 1)
+        return x, y
+
+    def slot_decimation_view_changed(self, *args: Any) -> None:
+        """Decimate raw data again if pixel width in view coordinates changed"""
+        if self._lod_kwargs is not None:
+            self.setData(*self.lod_data(), **self._lod_kwargs)
+            return
+        data_connector = getattr(self, "data_connector")
+        if data_connector.history is not None:
+            if self._raw_data is not None:
+                # Switch between live data and history
+                self.slot_new_data(*self._raw_data)
+            return
+        if self._culled_range is not None and self._raw_data is not None:
+            x_min, x_max = self.getViewBox().viewRange()[0]
+            if x_min < self._culled_range[0] or x_max > self._culled_range[1]:
+                # View left culled range
+                self.slot_new_data(*self._raw_data)
+                return
+        if self._raw_data is None or data_connector.decimation is None or data_connector.decimation_points is not None:
+            # Nothing to do without decimation or for fixed number of decimated points
+            return
+        bin_width = self._decimation_bin()
+        if bin_width is None:
+            return
+        last_bin_width = self._decimation_bin_width
+        if last_bin_width > 0 and last_bin_width * 0.99 <= bin_width <= last_bin_width * 2:
+            # Current decimation is still fine enough
+            return
+        self.slot_new_data(*self._raw_data)
+
+    def visible_bounds(self, x_min: float, x_max: float) -> Tuple[Any, Any]:
+        """Minimum and maximum of y for data with x in [x_min, x_max], NaN if there are no such data"""
+        data_connector = getattr(self, "data_connector", None)
+        if data_connector is not None and data_connector.y_index is not None:
+            return data_connector.visible_bounds(x_min, x_max)
+        x, y = self.full_data()
+        if x is None or y is None or len(x) == 0:
+            return np.nan, np.nan
+        x, y = np.asarray(x), np.asarray(y)
+        visible = y[(x >= x_min) & (x <= x_max)]
+        if visible.size == 0 or np.all(np.isnan(visible)):
+            return np.nan, np.nan
+        return np.nanmin(visible), np.nanmax(visible)
 
     def slot_connector_toggle(self, data_connector, flag: bool):
         if self.plot_widget is not None:
@@ -47,12 +290,16 @@ class MixinLivePlot(SupportsLivePlot):
             raise Exception("Plot must be added into LivePlotWidget before setting any data.")
 
 
-class MixinLiveBarPlot(SupportsLivePlot):
+class MixinLiveBarPlot(MixinTimeWindow):
     """Implements new_data slot for Bar Plot"""
     plot_widget: Optional[LivePlotWidget] = None
     sigPlotChanged = QtCore.Signal()
 
     def slot_new_data(self, y: Any, x: Any, kwargs: Dict) -> None:
+        if self._crop_to_time_window() and len(x) > 0:
+            # Only data inside time window are visible
+            start = self.time_window_start(x)
+            x, y = x[start:], y[start:]
         self.setData(x, y, **kwargs)
 
     def slot_connector_toggle(self, data_connector, flag: bool):
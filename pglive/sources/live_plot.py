@@ -1,4 +1,4 @@
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 
 import numpy as np  # type: ignore
 import pyqtgraph as pg  # type: ignore
@@ -23,12 +23,21 @@ class LiveLinePlot(pg.PlotDataItem, MixinLivePlot, MixinLeadingLine):
         except:
             pass
 
+        self._raw_data = None
+        self._history_cache = None
         super().clear()
 
     def data_bounds(self, ax: int = 0, offset: int = 0) -> Tuple:
-        x, y = self.getData()
+        bounds = self.tracked_bounds(ax, offset)
+        if bounds is not None:
+            return bounds
+        x, y = self.full_data()
         if x is None and y is None:
             return 0, 0
+        if self.time_window() is not None and len(x) > 0:
+            # Only data inside time window
+            start = self.time_window_start(x)
+            x, y, offset = x[start:], y[start:], 0
         if ax == 0:
             sub_range = x[-offset:]
         else:
@@ -36,7 +45,7 @@ class LiveLinePlot(pg.PlotDataItem, MixinLivePlot, MixinLeadingLine):
         return np.nanmin(sub_range), np.nanmax(sub_range)
 
     def data_tick(self, ax: int = 0):
-        x, y = self.getData()
+        x, y = self.full_data()
         if x is None and y is None:
             return 0, 0
         if ax == 0:
@@ -54,6 +63,8 @@ class LiveScatterPlot(pg.ScatterPlotItem, MixinLivePlot, MixinLeadingLine):
         except AttributeError:
             pass
 
+        self._raw_data = None
+        self._history_cache = None
         super().clear()
 
     def update_leading_line(self) -> None:
@@ -66,9 +77,16 @@ class LiveScatterPlot(pg.ScatterPlotItem, MixinLivePlot, MixinLeadingLine):
         self.update_leading_text(last_point[0], last_point[1])
 
     def data_bounds(self, ax: int = 0, offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
-        x, y = self.getData()
+        bounds = self.tracked_bounds(ax, offset)
+        if bounds is not None:
+            return bounds
+        x, y = self.full_data()
         if x.size == 0 and y.size == 0:
             return 0, 0
+        if self.time_window() is not None and len(x) > 0:
+            # Only data inside time window
+            start = self.time_window_start(x)
+            x, y, offset = x[start:], y[start:], 0
         if ax == 0:
             sub_range = x[-offset:]
         else:
@@ -76,7 +94,7 @@ class LiveScatterPlot(pg.ScatterPlotItem, MixinLivePlot, MixinLeadingLine):
         return np.nanmin(sub_range), np.nanmax(sub_range)
 
     def data_tick(self, ax: int = 0):
-        x, y = self.getData()
+        x, y = self.full_data()
         if x.size == 0 and y.size == 0:
             return 0, 0
         if ax == 0:
@@ -115,7 +133,19 @@ class LiveHBarPlot(pg.BarGraphItem, MixinLiveBarPlot, MixinLeadingLine):
             self._hl_kwargs["line"].setPos(self.opts["y"][-1])
         self.update_leading_text(self.opts["width"][-1], self.opts["y"][-1])
 
+    def time_window(self) -> Optional[float]:
+        # Connector x values are plotted on y axis, time window of x range doesn't apply
+        return None
+
+    def quantile_bounds(self, ax: int = 0) -> Optional[Tuple[Any, Any]]:
+        # Connector y values are plotted on x axis
+        return super().quantile_bounds(1 - ax)
+
     def data_bounds(self, ax: int = 0, offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        # Connector y values are plotted on x axis
+        bounds = self.tracked_bounds(1 - ax, offset)
+        if bounds is not None:
+            return bounds
         x, y = self.getData()
         if x is [] and y is []:
             return 0, 0
@@ -163,9 +193,16 @@ class LiveVBarPlot(pg.BarGraphItem, MixinLiveBarPlot, MixinLeadingLine):
         self.update_leading_text(self.opts["x"][-1], self.opts["height"][-1])
 
     def data_bounds(self, ax: int = 0, offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        bounds = self.tracked_bounds(ax, offset)
+        if bounds is not None:
+            return bounds
         x, y = self.getData()
         if x is [] and y is []:
             return 0, 0
+        if self.time_window() is not None and len(x) > 0:
+            # Only data inside time window
+            start = self.time_window_start(x)
+            x, y, offset = x[start:], y[start:], 0
         if ax == 0:
             sub_range = x[-offset:]
         else:
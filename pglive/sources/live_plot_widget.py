@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Union, Optional, Any, List, Dict, TYPE_CHECKING
+import time
+from typing import Union, Optional, Any, List, Dict, Tuple, TYPE_CHECKING
 
 import pyqtgraph as pg  # type: ignore
 from pyqtgraph import ViewBox  # type: ignore
@@ -9,7 +10,9 @@ from pyqtgraph.Qt import QtGui  # type: ignore
 
 from pglive.kwargs import Crosshair
 from pglive.sources.live_axis import LiveAxis
+from pglive.sources.frame_scheduler import FrameScheduler
 from pglive.sources.live_axis_range import LiveAxisRange
+from pglive.sources.stats import WidgetStats
 
 if TYPE_CHECKING:
     from pglive.sources.data_connector import DataConnector
@@ -21,10 +24,20 @@ class LivePlotWidget(pg.PlotWidget):
     sig_crosshair_moved = QtCore.Signal(QtCore.QPointF)
     sig_crosshair_out = QtCore.Signal()
     sig_crosshair_in = QtCore.Signal()
+    sig_stats = QtCore.Signal(object)
 
     def __init__(self, parent=None, background: str = 'default', plotItem=None,
                  x_range_controller: Optional[LiveAxisRange] = None,
-                 y_range_controller: Optional[LiveAxisRange] = None, **kwargs: Any) -> None:
+                 y_range_controller: Optional[LiveAxisRange] = None, frame_rate: Optional[float] = None,
+                 collect_stats: bool = False, **kwargs: Any) -> None:
+        """
+        :param x_range_controller: Range controller of x axis
+        :param y_range_controller: Range controller of y axis
+        :param float frame_rate: If set, updates of all DataConnectors are coalesced and plotted
+                                 once per frame at given rate in Hz
+        :param bool collect_stats: Collect performance stats, available by stats.snapshot() and
+                                   emitted by sig_stats every stats.interval seconds
+        """
         # Make sure we have LiveAxis in the bottom
         if "axisItems" not in kwargs:
             kwargs["axisItems"] = {"bottom": LiveAxis("bottom")}
@@ -34,6 +47,7 @@ class LivePlotWidget(pg.PlotWidget):
         self.x_range_controller = LiveAxisRange() if x_range_controller is None else x_range_controller
         self.y_range_controller = LiveAxisRange() if y_range_controller is None else y_range_controller
         self.manual_range = False
+        self.stats: Optional[WidgetStats] = WidgetStats() if collect_stats else None
 
         super().__init__(parent=parent, background=background, plotItem=plotItem, **kwargs)
         self.final_x_range: List[float] = [self.viewRect().x(), self.viewRect().width()]
@@ -76,9 +90,23 @@ class LivePlotWidget(pg.PlotWidget):
         self.getPlotItem().vb.sigRangeChangedManually.connect(self.sm)
         self.addItem = addItem
         self.removeItem = removeItem
+        self.frame_scheduler: Optional[FrameScheduler] = None
+        if frame_rate is not None:
+            self.frame_scheduler = FrameScheduler(self, frame_rate)
 
     def sm(self, *args, **kwargs) -> None:
         self.manual_range = True
+        if self.y_range_controller.fit_visible:
+            self.fit_visible_y_range()
+
+    def fit_visible_y_range(self) -> None:
+        """Fit y range to data of all DataConnectors visible in current x range"""
+        data_connectors = [item.data_connector for item in self.getPlotItem().items
+                           if hasattr(item, "data_connector")]
+        x_range = self.getPlotItem().vb.viewRange()[0]
+        y_range = self.y_range_controller.get_visible_y_range(data_connectors, x_range)
+        if y_range is not None:
+            self.set_range(yRange=y_range)
 
     def _update_crosshair_position(self) -> None:
         """Update position of crosshair based on mouse position"""
@@ -185,7 +213,11 @@ class LivePlotWidget(pg.PlotWidget):
     def paintEvent(self, ev: QtCore.QEvent) -> None:
         """Update crosshair position when replot"""
         self._update_crosshair_position()
-        return super().paintEvent(ev)
+        if self.stats is None:
+            return super().paintEvent(ev)
+        start = time.perf_counter()
+        super().paintEvent(ev)
+        self.stats.paint.add(time.perf_counter() - start)
 
     def hide_crosshair(self) -> None:
         """Hide crosshair items"""
@@ -202,24 +234,61 @@ class LivePlotWidget(pg.PlotWidget):
         self.manual_range = False
         self.set_range(xRange=self.final_x_range, yRange=self.final_y_range)
 
+    def _calculate_range(self, data_connector, tick: int) -> Tuple[List[float], List[float]]:
+        """Calculate x and y range of DataConnector"""
+        if self.stats is None and data_connector.stats is None:
+            return (self.x_range_controller.get_x_range(data_connector, tick),
+                    self.y_range_controller.get_y_range(data_connector, tick))
+        start = time.perf_counter()
+        final_x_range = self.x_range_controller.get_x_range(data_connector, tick)
+        final_y_range = self.y_range_controller.get_y_range(data_connector, tick)
+        duration = time.perf_counter() - start
+        if self.stats is not None:
+            self.stats.range.add(duration)
+        if data_connector.stats is not None:
+            data_connector.stats.range.add(duration)
+        return final_x_range, final_y_range
+
+    def _update_view_range(self, final_x_range: List[float], final_y_range: List[float]) -> None:
+        """Set new view range if it changed"""
+        if self.final_x_range != final_x_range or self.final_y_range != final_y_range:
+            self.final_x_range = final_x_range
+            self.final_y_range = final_y_range
+            if not self.manual_range:
+                self.set_range(xRange=final_x_range, yRange=final_y_range)
+                if self.stats is not None:
+                    self.stats.range_updates += 1
+        if self.manual_range and self.y_range_controller.fit_visible:
+            # New data may change y range of zoomed view
+            self.fit_visible_y_range()
+        if self.stats is not None and self.stats.emit_due():
+            self.sig_stats.emit(self.stats.snapshot())
+            self.stats.reset()
+
     def slot_roll_tick(self, data_connector, tick: int) -> None:
         if data_connector.ignore_auto_range:
             # Don't calculate range for this DataConnector
             return
         elif not data_connector.plot.isVisible():
             # Calculate range for this DataConnector, but don't display plot
-            self.x_range_controller.get_x_range(data_connector, tick)
-            self.y_range_controller.get_y_range(data_connector, tick)
+            self._calculate_range(data_connector, tick)
             return
 
-        final_x_range = self.x_range_controller.get_x_range(data_connector, tick)
-        final_y_range = self.y_range_controller.get_y_range(data_connector, tick)
-
-        if self.final_x_range != final_x_range or self.final_y_range != final_y_range:
-            self.final_x_range = final_x_range
-            self.final_y_range = final_y_range
-            if not self.manual_range:
-                self.set_range(xRange=final_x_range, yRange=final_y_range)
+        self._update_view_range(*self._calculate_range(data_connector, tick))
+
+    def slot_roll_ticks(self, ticks: Dict[DataConnector, int]) -> None:
+        """Calculate range of all DataConnectors updated in one frame and set view range only once"""
+        final_x_range, final_y_range = self.final_x_range, self.final_y_range
+        visible = False
+        for data_connector, tick in ticks.items():
+            if data_connector.ignore_auto_range:
+                # Don't calculate range for this DataConnector
+                continue
+            final_x_range, final_y_range = self._calculate_range(data_connector, tick)
+            visible = visible or data_connector.plot.isVisible()
+
+        if visible:
+            self._update_view_range(final_x_range, final_y_range)
 
     def slot_connector_toggle(self, data_connector: DataConnector, flag: bool) -> None:
         """Reset both range controllers when data_connector sets new data"""
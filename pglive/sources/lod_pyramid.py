@@ -0,0 +1,137 @@
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from pglive.sources.ring_buffer import GrowingBuffer
+
+
+def _aggregate(x_start: np.ndarray, x_end: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+               min_first: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Aggregate 2D arrays of shape (blocks, factor) into one min/max block per row, NaN values are ignored"""
+    rows = np.arange(lo.shape[0])
+    nan_lo, nan_hi = np.isnan(lo), np.isnan(hi)
+    min_index = np.where(nan_lo, np.inf, lo).argmin(axis=1)
+    max_index = np.where(nan_hi, -np.inf, hi).argmax(axis=1)
+    first = np.where(min_index == max_index, min_first[rows, min_index], min_index < max_index)
+    return x_start[:, 0], x_end[:, -1], lo[rows, min_index], hi[rows, max_index], first
+
+
+class LodLevel:
+    """One level of LodPyramid, every block holds x extent and min/max of factor ** level samples"""
+
+    def __init__(self, x_dtype: Any = np.float64, y_dtype: Any = np.float64) -> None:
+        self.x_start = GrowingBuffer(x_dtype)
+        self.x_end = GrowingBuffer(x_dtype)
+        self.lo = GrowingBuffer(y_dtype)
+        self.hi = GrowingBuffer(y_dtype)
+        # True if minimum precedes maximum in the block
+        self.min_first = GrowingBuffer(np.bool_)
+
+    def __len__(self) -> int:
+        return len(self.min_first)
+
+    def extend(self, x_start: np.ndarray, x_end: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+               min_first: np.ndarray) -> None:
+        self.x_start.extend(x_start)
+        self.x_end.extend(x_end)
+        self.lo.extend(lo)
+        self.hi.extend(hi)
+        self.min_first.extend(min_first)
+
+    def blocks(self, start: int, stop: int, factor: int) -> Tuple[np.ndarray, ...]:
+        """Return blocks [start, stop) reshaped into (blocks / factor, factor)"""
+        return tuple(buffer.view()[start:stop].reshape(-1, factor) for buffer in
+                     (self.x_start, self.x_end, self.lo, self.hi, self.min_first))
+
+    def points(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Two points per block, minimum and maximum in the order of their occurrence"""
+        min_first = self.min_first.view()[start:stop]
+        lo, hi = self.lo.view()[start:stop], self.hi.view()[start:stop]
+        x = np.empty(2 * min_first.size, dtype=self.x_start.dtype)
+        y = np.empty(2 * min_first.size, dtype=lo.dtype)
+        x[0::2] = self.x_start.view()[start:stop]
+        x[1::2] = self.x_end.view()[start:stop]
+        y[0::2] = np.where(min_first, lo, hi)
+        y[1::2] = np.where(min_first, hi, lo)
+        return x, y
+
+
+class LodPyramid:
+    """
+    Level of detail pyramid of unbounded data with sorted x.
+    Level n holds min/max aggregates of factor ** n raw samples and is maintained incrementally on append.
+    Query returns data of the coarsest level, that still has at least one point per pixel column,
+    so amount of returned data depends on plot width rather than on length of history.
+    Data are only appended, so query can run without lock while data are appended in other thread.
+    """
+
+    def __init__(self, x: GrowingBuffer, y: GrowingBuffer, factor: int = 4) -> None:
+        """
+        :param x: Raw x data, level 0 of the pyramid
+        :param y: Raw y data, level 0 of the pyramid
+        :param int factor: Number of blocks aggregated into one block of the next level
+        """
+        assert factor >= 2
+        self.x = x
+        self.y = y
+        self.factor = factor
+        self.levels: List[LodLevel] = []
+
+    def clear(self) -> None:
+        self.levels = []
+
+    def update(self) -> None:
+        """Aggregate all complete blocks of newly appended data"""
+        factor = self.factor
+        below = len(self.y)
+        index = 0
+        while below >= factor:
+            if index == len(self.levels):
+                self.levels.append(LodLevel(self.x.dtype, self.y.dtype))
+            level = self.levels[index]
+            consumed = len(level) * factor
+            blocks = (below - consumed) // factor
+            if blocks > 0:
+                stop = consumed + blocks * factor
+                if index == 0:
+                    x = self.x.view()[consumed:stop].reshape(-1, factor)
+                    y = self.y.view()[consumed:stop].reshape(-1, factor)
+                    order = np.broadcast_to(True, y.shape)
+                    level.extend(*_aggregate(x, x, y, y, order))
+                else:
+                    level.extend(*_aggregate(*self.levels[index - 1].blocks(consumed, stop, factor)))
+            below = len(level)
+            index += 1
+
+    def query(self, x_min: float, x_max: float, pixels: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return data visible between x_min and x_max with resolution of at least one point per pixel"""
+        raw_x, raw_y = self.x.view(), self.y.view()
+        size = min(raw_x.size, raw_y.size)
+        # Include one point outside of view on both sides, so line continues out of view
+        start = max(int(np.searchsorted(raw_x[:size], x_min, "left")) - 1, 0)
+        stop = min(int(np.searchsorted(raw_x[:size], x_max, "right")) + 1, size)
+        level = 0
+        # Every block yields two points, use the coarsest level with at least one point per pixel
+        while level < len(self.levels) and 2 * (stop - start) / self.factor ** (level + 1) >= max(pixels, 1):
+            level += 1
+        if level == 0:
+            return raw_x[start:stop], raw_y[start:stop]
+
+        # Coarse blocks first, then finer blocks and raw samples of not yet aggregated tail
+        xs, ys = [], []
+        for index in range(level, 0, -1):
+            block = self.factor ** index
+            lod_level = self.levels[index - 1]
+            first = start // block
+            last = min(-(-stop // block), len(lod_level))
+            if last > first:
+                x, y = lod_level.points(first, last)
+                xs.append(x)
+                ys.append(y)
+                start = last * block
+            if start >= stop:
+                break
+        if start < stop:
+            xs.append(raw_x[start:stop])
+            ys.append(raw_y[start:stop])
+        return np.concatenate(xs), np.concatenate(ys)
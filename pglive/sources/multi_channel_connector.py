@@ -0,0 +1,312 @@
+import time
+from math import inf
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pyqtgraph import PlotDataItem  # type: ignore
+from pyqtgraph.Qt import QtCore  # type: ignore
+
+from pglive.sources.decimation import is_sorted
+from pglive.sources.live_plot import MixinLivePlot, MixinLiveBarPlot, make_live
+from pglive.sources.ring_buffer import RingBuffer, GrowingBuffer, _as_1d_array
+from pglive.sources.utils import NUM_LIST
+
+
+class ChannelConnector:
+    """
+    One channel of MultiChannelConnector, connects one plot with its row of shared storage.
+    Provides the same interface to plots, LivePlotWidget and FrameScheduler as DataConnector.
+    """
+    # Features of DataConnector, which are not available per channel
+    stats = None
+    lod = None
+    history = None
+    bounds = None
+    x_index = None
+    y_index = None
+
+    def __init__(self, connector: "MultiChannelConnector", index: int,
+                 plot: Union[MixinLivePlot, MixinLiveBarPlot]) -> None:
+        self.connector = connector
+        self.index = index
+        self.plot = plot
+        if not isinstance(plot, (MixinLivePlot, MixinLiveBarPlot)):
+            # Attempt to convert plot into live if it's not already
+            make_live(plot)
+
+        def toggle_plot_visibility(flag):
+            """Override setVisible of PlotDataItem"""
+            PlotDataItem.setVisible(self.plot, flag)
+            self.plot.slot_connector_toggle(self, flag)
+
+        setattr(self.plot, "data_connector", self)
+        setattr(self.plot, "setVisible", toggle_plot_visibility)
+
+    @property
+    def data_lock(self) -> Lock:
+        return self.connector.data_lock
+
+    @property
+    def x(self) -> Union[RingBuffer, GrowingBuffer]:
+        return self.connector.x
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.connector.y.view()[self.index]
+
+    @property
+    def rolling_index(self) -> int:
+        return self.connector.rolling_index
+
+    @property
+    def x_sorted(self) -> bool:
+        return self.connector.x_sorted
+
+    @property
+    def ignore_auto_range(self) -> bool:
+        return self.connector.ignore_auto_range
+
+    @property
+    def decimation(self) -> Optional[str]:
+        return self.connector.decimation
+
+    @property
+    def decimation_points(self) -> Optional[int]:
+        return self.connector.decimation_points
+
+    def _data_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get y and x data to be plotted, must be called with data_lock acquired"""
+        y, x = self.connector._data_arrays()
+        return y[self.index], x
+
+    def slot_new_data(self, y: Any, x: Any, kwargs: Dict) -> None:
+        self.plot.slot_new_data(y, x, kwargs)
+
+
+class MultiChannelConnector(QtCore.QObject):
+    """
+    Connect N plots with channels sampled at the same x, e.g. channels of one ADC with common clock.
+    Data are stored in one 2D NumPy buffer of channels x samples and one x buffer shared by all channels.
+    Every append takes one frame of all channels under one data_lock and emits signals once,
+    plots are then updated one after another and view range of every LivePlotWidget is set at most once.
+    """
+    sig_new_data = QtCore.Signal(object, object, dict)
+    sig_data_roll_tick = QtCore.Signal(object, int)
+    sig_paused = QtCore.Signal()
+    sig_resumed = QtCore.Signal()
+    sig_clear = QtCore.Signal()
+    paused: bool = False
+    # Last update time, using perf_counter for most precise counter
+    last_update: float = 0.
+    last_plot: float = 0.
+
+    def __init__(self, plots: Sequence[Union[MixinLivePlot, MixinLiveBarPlot]], max_points: float = inf,
+                 update_rate: float = inf, plot_rate: float = inf, ignore_auto_range: bool = False,
+                 dtype: Any = np.float64, x_dtype: Any = None, mirrored: bool = False,
+                 decimation: Optional[str] = None, decimation_points: Optional[int] = None) -> None:
+        """
+        :param plots: Plots to be connected with channels, one plot per channel
+        :param max_points: Maximum amount of data points of every channel to plot
+        :param float update_rate: Update rate in Hz
+        :param float plot_rate: Plot rate in Hz
+        :param bool ignore_auto_range: If set to True auto range is not calculated when new data is acquired
+        :param dtype: NumPy dtype of channels storage
+        :param x_dtype: NumPy dtype of x storage, defaults to dtype if it's floating point dtype, float64 otherwise
+        :param bool mirrored: Use mirrored ring buffer, so data are passed to plots without any copy
+        :param str decimation: Decimation method of all plots, one of pglive.kwargs.Decimation
+        :param int decimation_points: Target number of points of LTTB decimation, one point per pixel column if None
+        """
+        super().__init__()
+        assert len(plots) > 0
+        self.channels = len(plots)
+        self.rolling_index = 0
+        self.ignore_auto_range = ignore_auto_range
+        self.mirrored = mirrored
+        self.dtype = np.dtype(dtype)
+        if x_dtype is None:
+            x_dtype = self.dtype if self.dtype.kind == "f" else np.float64
+        self.x_dtype = np.dtype(x_dtype)
+        self.decimation = decimation
+        self.decimation_points = decimation_points
+        # Number of frames dropped because of data_lock being held
+        self.dropped_samples = 0
+        # Data update lock, ensuring thread-safety
+        self.data_lock = Lock()
+        assert max_points > 0
+        self.max_points = max_points
+        # Calculating update timeout from update_rate frequency
+        self.update_timeout = 1 / update_rate
+        self.plot_timeout = 1 / plot_rate
+        self.x = self._make_storage(self.x_dtype)
+        self.y = self._make_storage(self.dtype, self.channels)
+        # Data arrays of the last write, shared by all channels
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        # Stored x is non-decreasing, checked only for written data, so plots don't scan x on every frame
+        self.x_sorted = True
+        self.channel_connectors: List[ChannelConnector] = [ChannelConnector(self, index, plot)
+                                                           for index, plot in enumerate(plots)]
+        self.sig_new_data.connect(self.slot_new_data)
+        self.sig_data_roll_tick.connect(self.slot_roll_tick)
+        self.sig_clear.connect(self.slot_clear)
+
+    @property
+    def plots(self) -> List[Union[MixinLivePlot, MixinLiveBarPlot]]:
+        return [channel.plot for channel in self.channel_connectors]
+
+    def _make_storage(self, dtype: Any, channels: Optional[int] = None) -> Union[RingBuffer, GrowingBuffer]:
+        """Create new data storage according to max_points"""
+        if self.max_points == inf:
+            return GrowingBuffer(dtype, channels=channels)
+        return RingBuffer(int(self.max_points), dtype, mirrored=self.mirrored, channels=channels)
+
+    def pause(self) -> None:
+        """Pause data plotting"""
+        self.paused = True
+        self.sig_paused.emit()
+
+    def resume(self) -> None:
+        """Resume data plotting"""
+        self.paused = False
+        self.sig_resumed.emit()
+
+    def clear(self) -> None:
+        """Clear all data"""
+        with self.data_lock:
+            self.x.clear()
+            self.y.clear()
+            self._arrays = None
+            self.x_sorted = True
+            self.rolling_index = 0
+            for channel in self.channel_connectors:
+                frame_scheduler = getattr(getattr(channel.plot, "plot_widget", None), "frame_scheduler", None)
+                if frame_scheduler is not None:
+                    frame_scheduler.discard(channel)
+            self.sig_clear.emit()
+
+    def _skip_update(self, samples: int = 1) -> bool:
+        """Skip data update"""
+        if self.paused:
+            return True
+        if (time.perf_counter() - self.last_update) < self.update_timeout:
+            return True
+        if self.data_lock.locked():
+            # Data are lost, because other thread is holding data_lock
+            self.dropped_samples += samples
+            return True
+        return False
+
+    def _skip_plot(self) -> bool:
+        """Skip data plot"""
+        return self.paused or (time.perf_counter() - self.last_plot) < self.plot_timeout
+
+    def _data_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get 2D y and x data to be plotted, must be called with data_lock acquired"""
+        if self._arrays is None:
+            # Non-mirrored buffer copies data, do it only once for all channels
+            self._arrays = (self.y.view(), self.x.view())
+        return self._arrays
+
+    def _update_data(self, tick: int, **kwargs) -> None:
+        """Update data of all channels and last update time"""
+        emit = False
+        for channel in self.channel_connectors:
+            frame_scheduler = getattr(getattr(channel.plot, "plot_widget", None), "frame_scheduler", None)
+            if frame_scheduler is not None:
+                # Plot data in the next frame of LivePlotWidget
+                frame_scheduler.mark_dirty(channel, tick, kwargs)
+            else:
+                emit = True
+        if emit:
+            self.sig_new_data.emit(*self._data_arrays(), kwargs)
+            self.sig_data_roll_tick.emit(self, tick)
+        self.last_plot = time.perf_counter()
+
+    def _frame(self, y: Any, x: Optional[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert frames of channels into 2D y and x, generating implicit x continuing after the last x value"""
+        y = np.asarray(y).reshape(self.channels, -1)
+        if x is None:
+            start = self.x[-1] + 1 if len(self.x) > 0 else 0
+            x = np.arange(start, start + y.shape[1])
+        x = _as_1d_array(x)
+        if x.size != y.shape[1]:
+            raise ValueError(f"Expected {x.size} samples of {self.channels} channels, got shape {y.shape}")
+        return y, x
+
+    def _update_x_sorted(self, x: np.ndarray, reset: bool = False) -> None:
+        """Check whether appended x keeps stored x sorted, must be called with data_lock acquired before x is stored"""
+        if reset:
+            self.x_sorted = True
+        if self.x_sorted and x.size > 0:
+            self.x_sorted = is_sorted(x) and (len(self.x) == 0 or bool(x[0] >= self.x[-1]))
+
+    def cb_set_data(self, y: Any, x: Optional[Union[NUM_LIST, np.ndarray]] = None, **kwargs) -> None:
+        """Replace current data, y is 2D array-like of channels x samples"""
+        if self._skip_update():
+            return
+        y, x = self._frame(y, np.arange(np.shape(y)[-1]) if x is None else x)
+        with self.data_lock:
+            self._update_x_sorted(x, reset=True)
+            self.y.replace(y)
+            self.x.replace(x)
+            self._arrays = None
+            self.last_update = time.perf_counter()
+
+            if not self._skip_plot():
+                self._update_data(len(self.x) - 1, **kwargs)
+                self.rolling_index = len(self.x)
+
+    def cb_append_data_point(self, y: Any, x: Optional[Union[int, float]] = None, **kwargs) -> None:
+        """Append one frame, y holds one value of every channel"""
+        if self._skip_update():
+            return
+        with self.data_lock:
+            frame_y, frame_x = self._frame(y, None if x is None else (x,))
+            self._update_x_sorted(frame_x)
+            self.y.extend(frame_y)
+            self.x.extend(frame_x)
+            self._arrays = None
+            self.last_update = time.perf_counter()
+
+            if not self._skip_plot():
+                self._update_data(self.rolling_index, **kwargs)
+                self.rolling_index += 1
+
+    def cb_append_data_array(self, y: Any, x: Optional[Union[NUM_LIST, np.ndarray]] = None, **kwargs) -> None:
+        """Append frames, y is 2D array-like of channels x samples, copied by one slice assignment"""
+        samples = np.shape(y)[-1]
+        if self._skip_update(samples):
+            return
+        with self.data_lock:
+            y, x = self._frame(y, x)
+            self._update_x_sorted(x)
+            self.y.extend(y)
+            self.x.extend(x)
+            self._arrays = None
+            self.last_update = time.perf_counter()
+
+            if not self._skip_plot():
+                self._update_data(self.rolling_index, **kwargs)
+                self.rolling_index += samples
+
+    def slot_new_data(self, y: np.ndarray, x: np.ndarray, kwargs: Dict) -> None:
+        """Fan data out to plots of all channels not plotted by FrameScheduler"""
+        for channel in self.channel_connectors:
+            if getattr(getattr(channel.plot, "plot_widget", None), "frame_scheduler", None) is None:
+                channel.plot.slot_new_data(y[channel.index], x, kwargs)
+
+    def slot_roll_tick(self, _: Any, tick: int) -> None:
+        """Calculate view range once per LivePlotWidget"""
+        widgets: Dict[Any, Dict[ChannelConnector, int]] = {}
+        for channel in self.channel_connectors:
+            plot_widget = getattr(channel.plot, "plot_widget", None)
+            if plot_widget is None:
+                raise Exception("Plot must be added into LivePlotWidget before setting any data.")
+            if plot_widget.frame_scheduler is None:
+                widgets.setdefault(plot_widget, {})[channel] = tick
+        for plot_widget, ticks in widgets.items():
+            plot_widget.slot_roll_ticks(ticks)
+
+    def slot_clear(self) -> None:
+        for plot in self.plots:
+            plot.clear()
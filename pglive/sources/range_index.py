@@ -0,0 +1,125 @@
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from pglive.sources.ring_buffer import _as_1d_array
+
+
+def _next_power_of_two(value: int) -> int:
+    return 1 << max(value - 1, 0).bit_length()
+
+
+class RangeExtremaIndex:
+    """
+    Segment tree of minimum and maximum of appended values, maintained incrementally.
+    Values are addressed by absolute index in order of their append. Tree leaves are reused as a ring,
+    so with fixed window only last window values can be queried. Oldest values can be dropped,
+    unbounded index then grows only with the number of kept values.
+    Minimum and maximum of any range of values is returned in O(log N), NaN values are ignored.
+    """
+
+    def __init__(self, window: Optional[int] = None) -> None:
+        """
+        :param int window: Number of last values available for queries, all values are kept if None
+        """
+        assert window is None or window > 0
+        self.window = window
+        # Number of values ever appended, used as absolute index of the next value
+        self.count = 0
+        # Absolute index of the oldest kept value
+        self.first = 0
+        self._allocate(_next_power_of_two(window if window is not None else 1024))
+
+    def _allocate(self, size: int) -> None:
+        self.size = size
+        # Level 0 are leaves, every next level has half the size, the last one is the root
+        self._min: List[np.ndarray] = [np.full(size >> level, np.nan) for level in range(size.bit_length())]
+        self._max: List[np.ndarray] = [np.full(size >> level, np.nan) for level in range(size.bit_length())]
+
+    def clear(self) -> None:
+        self.count = 0
+        self.first = 0
+        for level in (*self._min, *self._max):
+            level.fill(np.nan)
+
+    def _grow(self, size: int) -> None:
+        """Reallocate tree of unbounded index and rebuild all levels from kept leaves"""
+        indexes = np.arange(self.first, self.count)
+        leaves = self._min[0][indexes % self.size]
+        self._allocate(_next_power_of_two(size))
+        self._min[0][indexes % self.size] = leaves
+        self._max[0][indexes % self.size] = leaves
+        self._update(0, self.size)
+
+    def _update(self, start: int, stop: int) -> None:
+        """Recalculate all parents of leaves [start, stop)"""
+        for level in range(1, len(self._min)):
+            start >>= 1
+            stop = ((stop - 1) >> 1) + 1
+            lower_min, lower_max = self._min[level - 1], self._max[level - 1]
+            self._min[level][start:stop] = np.fmin(lower_min[2 * start:2 * stop:2], lower_min[2 * start + 1:2 * stop:2])
+            self._max[level][start:stop] = np.fmax(lower_max[2 * start:2 * stop:2], lower_max[2 * start + 1:2 * stop:2])
+
+    def append(self, value: Any) -> None:
+        self.extend((value,))
+
+    def extend(self, values: Any) -> None:
+        values = _as_1d_array(values).astype(np.float64, copy=False)
+        if values.size == 0:
+            return
+        if self.window is None:
+            if self.count + values.size - self.first > self.size:
+                self._grow(2 * (self.count + values.size - self.first))
+        elif values.size > self.window:
+            # Older values would be overwritten immediately
+            self.count += values.size - self.window
+            values = values[-self.window:]
+        start = self.count
+        self.count += values.size
+        if self.window is not None:
+            self.first = max(self.first, self.count - self.window)
+        first = start % self.size
+        # Values wrap around the end of leaves at most once
+        head = values[:self.size - first]
+        for offset, part in ((first, head), (0, values[head.size:])):
+            if part.size > 0:
+                self._min[0][offset:offset + part.size] = part
+                self._max[0][offset:offset + part.size] = part
+                self._update(offset, offset + part.size)
+
+    def _query(self, start: int, stop: int) -> Tuple[Any, Any]:
+        """Minimum and maximum of leaves [start, stop)"""
+        lo, hi = np.nan, np.nan
+        level = 0
+        while start < stop:
+            if start & 1:
+                lo = np.fmin(lo, self._min[level][start])
+                hi = np.fmax(hi, self._max[level][start])
+                start += 1
+            if stop & 1:
+                stop -= 1
+                lo = np.fmin(lo, self._min[level][stop])
+                hi = np.fmax(hi, self._max[level][stop])
+            start >>= 1
+            stop >>= 1
+            level += 1
+        return lo, hi
+
+    def drop(self, count: int) -> None:
+        """Drop count oldest values, they are no longer available for queries"""
+        self.first = min(self.first + max(count, 0), self.count)
+
+    def bounds(self, start: int, stop: int) -> Tuple[Any, Any]:
+        """
+        Return minimum and maximum of values with absolute index in [start, stop),
+        NaN if there are no such values or all of them are NaN.
+        """
+        start, stop = max(start, self.first), min(stop, self.count)
+        if start >= stop:
+            return np.nan, np.nan
+        first = start % self.size
+        last = first + stop - start
+        if last <= self.size:
+            return self._query(first, last)
+        head, tail = self._query(first, self.size), self._query(0, last - self.size)
+        return np.fmin(head[0], tail[0]), np.fmax(head[1], tail[1])
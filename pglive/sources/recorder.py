@@ -0,0 +1,171 @@
+import pickle
+import struct
+import time
+from math import inf
+from threading import Lock, Event
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"PGLREC1\n"
+# Recorded DataConnector methods, their index is stored in every record
+METHODS = ("cb_set_data", "cb_append_data_point", "cb_append_data_array")
+# Record header: method index, timestamp in seconds since recording start, size of kwargs
+_RECORD = struct.Struct("<Bdi")
+# Value kinds
+_NONE, _ARRAY, _PICKLE = 0, 1, 2
+
+
+def _write_value(file: BinaryIO, value: Any) -> None:
+    """Write numeric arrays and numbers raw, anything else is pickled, so it's replayed with the same type"""
+    if value is None:
+        file.write(struct.pack("<B", _NONE))
+        return
+    array = np.asarray(value) if isinstance(value, (np.ndarray, np.number, int, float)) else None
+    if array is None or array.dtype.kind not in "biuf":
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        file.write(struct.pack("<BQ", _PICKLE, len(data)))
+        file.write(data)
+        return
+    dtype = array.dtype.str.encode()
+    file.write(struct.pack(f"<BB{len(dtype)}sB{array.ndim}Q", _ARRAY, len(dtype), dtype, array.ndim, *array.shape))
+    file.write(np.ascontiguousarray(array).tobytes())
+
+
+def _read_exact(file: BinaryIO, size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise EOFError("Truncated recording")
+    return data
+
+
+def _read_value(file: BinaryIO) -> Any:
+    kind, = struct.unpack("<B", _read_exact(file, 1))
+    if kind == _NONE:
+        return None
+    if kind == _PICKLE:
+        size, = struct.unpack("<Q", _read_exact(file, 8))
+        return pickle.loads(_read_exact(file, size))
+    dtype_size, = struct.unpack("<B", _read_exact(file, 1))
+    dtype = np.dtype(_read_exact(file, dtype_size).decode())
+    ndim, = struct.unpack("<B", _read_exact(file, 1))
+    shape = struct.unpack(f"<{ndim}Q", _read_exact(file, 8 * ndim))
+    array = np.frombuffer(_read_exact(file, dtype.itemsize * int(np.prod(shape))), dtype=dtype).reshape(shape)
+    # Scalars are replayed as Python numbers
+    return array.item() if ndim == 0 else array
+
+
+class StreamRecorder:
+    """
+    Record every cb_set_data, cb_append_data_point and cb_append_data_array call of DataConnector
+    with its timestamp, x, y and kwargs into compact binary file.
+    Numeric data are stored as raw arrays, other data (candles, categories) and kwargs are pickled.
+    Recording can be replayed by StreamReplay.
+    """
+
+    def __init__(self, data_connector: Any, path: str) -> None:
+        """
+        :param data_connector: DataConnector to be recorded
+        :param str path: Path of recording file, existing file is overwritten
+        """
+        self.data_connector = data_connector
+        self.path = path
+        self.records = 0
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(MAGIC)
+        self._lock = Lock()
+        self._started = time.perf_counter()
+        for index, name in enumerate(METHODS):
+            setattr(data_connector, name, self._wrap(index, getattr(data_connector, name)))
+
+    def _wrap(self, index: int, method: Any) -> Any:
+        def record(y: Any, x: Any = None, **kwargs: Any) -> None:
+            self._record(index, y, x, kwargs)
+            method(y, x, **kwargs)
+
+        return record
+
+    def _record(self, index: int, y: Any, x: Any, kwargs: Dict) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            data = pickle.dumps(kwargs, protocol=pickle.HIGHEST_PROTOCOL) if kwargs else b""
+            self._file.write(_RECORD.pack(index, time.perf_counter() - self._started, len(data)))
+            self._file.write(data)
+            _write_value(self._file, y)
+            _write_value(self._file, x)
+            self.records += 1
+
+    def stop(self) -> None:
+        """Stop recording, restore DataConnector methods and close file"""
+        with self._lock:
+            if self._file is None:
+                return
+            for name in METHODS:
+                delattr(self.data_connector, name)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "StreamRecorder":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+
+class StreamReplay:
+    """
+    Replay recording of StreamRecorder into DataConnectors.
+    Recording contains pickled data, replay only trusted files.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param str path: Path of recording file
+        """
+        self.path = path
+        self.stop_event = Event()
+
+    def __iter__(self) -> Iterator[Tuple[float, str, Any, Any, Dict]]:
+        """Iterate over recorded calls as tuples of timestamp, method name, y, x and kwargs"""
+        with open(self.path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a pglive recording")
+            while True:
+                header = file.read(_RECORD.size)
+                if not header:
+                    return
+                if len(header) != _RECORD.size:
+                    raise EOFError("Truncated recording")
+                index, timestamp, kwargs_size = _RECORD.unpack(header)
+                kwargs = pickle.loads(_read_exact(file, kwargs_size)) if kwargs_size else {}
+                y = _read_value(file)
+                x = _read_value(file)
+                yield timestamp, METHODS[index], y, x, kwargs
+
+    def replay(self, *data_connectors: Any, speed: float = 1.) -> int:
+        """
+        Feed recorded calls into all data_connectors, blocks until recording ends or stop is called.
+        Return number of replayed calls.
+        :param data_connectors: DataConnectors fed by recorded calls
+        :param float speed: Replay speed, 1 is real time, 10 is ten times faster and inf is as fast as possible
+        """
+        assert speed > 0
+        self.stop_event.clear()
+        started = time.perf_counter()
+        calls = 0
+        for timestamp, method, y, x, kwargs in self:
+            if speed != inf:
+                delay = timestamp / speed - (time.perf_counter() - started)
+                if delay > 0 and self.stop_event.wait(delay):
+                    break
+            if self.stop_event.is_set():
+                break
+            for data_connector in data_connectors:
+                getattr(data_connector, method)(y, x, **kwargs)
+            calls += 1
+        return calls
+
+    def stop(self) -> None:
+        """Stop running replay"""
+        self.stop_event.set()
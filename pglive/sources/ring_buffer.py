@@ -0,0 +1,295 @@
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+
+from pglive.sources.utils import NUM
+
+
+def _as_1d_array(values: Any) -> np.ndarray:
+    """Convert values into 1D array, ndarray is returned without copy"""
+    values = np.asarray(values)
+    if values.ndim != 1:
+        values = values.reshape(-1)
+    return values
+
+
+def _as_items(values: Any, channels: Optional[int]) -> np.ndarray:
+    """Convert values into 1D array, or into 2D array of channels x values if channels are set"""
+    if channels is None:
+        return _as_1d_array(values)
+    return np.asarray(values).reshape(channels, -1)
+
+
+class RingBuffer:
+    """
+    Fixed capacity FIFO buffer backed by preallocated NumPy array.
+    Once buffer is full, oldest values are overwritten by the new ones, same as deque with maxlen.
+    Values are stored in fixed dtype, so no Python objects are created when buffer is converted into array.
+
+    In mirrored mode every value is written twice, at index i and i + length of the ring.
+    Stored values are then always available as one contiguous slice, so view() doesn't copy or allocate any data.
+    Ring length is capacity + headroom, so mirrored buffer stores 2 * (capacity + headroom) values,
+    4 times capacity with the default headroom. Returned view stays valid for headroom new values,
+    if more values are written before the next view(), data are first moved into a new array,
+    so the last returned view is never overwritten in place.
+
+    With channels set, every value is a frame of one value per channel, data are stored as 2D array
+    of channels x values and view() returns one row per channel.
+    """
+
+    def __init__(self, capacity: int, dtype: Any = np.float64, mirrored: bool = False,
+                 headroom: Optional[int] = None, channels: Optional[int] = None) -> None:
+        """
+        :param int capacity: Maximum number of stored values
+        :param dtype: NumPy dtype of stored values
+        :param bool mirrored: Write every value twice to get contiguous zero-copy views
+        :param int headroom: Number of writes the last mirrored view stays valid for without copy, defaults to capacity
+        :param int channels: Number of channels of every value, values are scalars if None
+        """
+        assert capacity > 0
+        assert channels is None or channels > 0
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self.mirrored = mirrored
+        self.channels = channels
+        if mirrored:
+            self.headroom = self.capacity if headroom is None else int(headroom)
+            # Length of the ring, data array holds two copies of it
+            self._length = self.capacity + self.headroom
+            self._data = np.empty(self._shape(2 * self._length), dtype=self.dtype)
+        else:
+            self.headroom = 0
+            self._length = self.capacity
+            self._data = np.empty(self._shape(self._length), dtype=self.dtype)
+        # Index of next write
+        self._head = 0
+        self._size = 0
+        # Mirrored view was returned and number of values written since then
+        self._viewed = False
+        self._written = 0
+
+    def _shape(self, length: int) -> Tuple[int, ...]:
+        return (length,) if self.channels is None else (self.channels, length)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += self._size
+            if not 0 <= index < self._size:
+                raise IndexError("RingBuffer index out of range")
+            return self._data[..., (self._head - self._size + index) % self._length]
+        return self.view()[..., index]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __array__(self, dtype: Optional[Any] = None, copy: Optional[bool] = None) -> np.ndarray:
+        data = self.view()
+        if dtype is not None and np.dtype(dtype) != data.dtype:
+            return data.astype(dtype)
+        return data
+
+    @property
+    def maxlen(self) -> int:
+        """Maximum number of stored values, same as deque.maxlen"""
+        return self.capacity
+
+    def _protect_view(self, count: int) -> None:
+        """Move data into new array if writing count values would overwrite the last returned mirrored view"""
+        self._written += count
+        if self._written > self.headroom:
+            # Returned view keeps the old array
+            self._data = self._data.copy()
+            self._viewed = False
+
+    def append(self, value: NUM) -> None:
+        """Append one value, overwrite the oldest one if buffer is full"""
+        if self._viewed:
+            self._protect_view(1)
+        self._data[..., self._head] = value
+        if self.mirrored:
+            self._data[..., self._head + self._length] = value
+        self._head = (self._head + 1) % self._length
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, values: Any) -> None:
+        """
+        Append array of values using vectorised slice assignment.
+        Values can be any sequence or ndarray of any numeric dtype, non-contiguous arrays are not copied.
+        """
+        values = _as_items(values, self.channels)
+        count = values.shape[-1]
+        if count == 0:
+            return
+        if count >= self.capacity:
+            # Only the last capacity values will survive
+            values = values[..., -self.capacity:]
+            count = self.capacity
+        if self._viewed:
+            self._protect_view(count)
+        head, length = self._head, self._length
+        first = min(count, length - head)
+        self._data[..., head:head + first] = values[..., :first]
+        self._data[..., :count - first] = values[..., first:]
+        if self.mirrored:
+            self._data[..., head + length:head + length + first] = values[..., :first]
+            self._data[..., length:length + count - first] = values[..., first:]
+        self._head = (head + count) % length
+        self._size = min(self._size + count, self.capacity)
+
+    def replace(self, values: Any) -> None:
+        """Replace whole content of buffer"""
+        self.clear()
+        self.extend(values)
+
+    def clear(self) -> None:
+        """Remove all values"""
+        self._head = 0
+        self._size = 0
+
+    def drop(self, count: int) -> None:
+        """Remove count oldest values"""
+        self._size -= min(max(count, 0), self._size)
+
+    def view(self) -> np.ndarray:
+        """
+        Return ordered stored values, from the oldest to the newest.
+        Mirrored buffer returns contiguous view into the buffer, otherwise copy of data is returned.
+        """
+        start = (self._head - self._size) % self._length
+        if self.mirrored:
+            self._viewed = True
+            self._written = 0
+            return self._data[..., start:start + self._size]
+        if start + self._size <= self._length:
+            return self._data[..., start:start + self._size].copy()
+        return np.concatenate((self._data[..., start:], self._data[..., :self._head]), axis=-1)
+
+    def searchsorted(self, value: Any) -> int:
+        """Number of sorted values less than value, found by binary search in stored segments without any copy"""
+        assert self.channels is None
+        start = (self._head - self._size) % self._length
+        if self.mirrored or start + self._size <= self._length:
+            return int(np.searchsorted(self._data[start:start + self._size], value, side="left"))
+        # Older values are at the end of data array and newer values at its beginning
+        older = self._data[start:]
+        if older[-1] >= value:
+            return int(np.searchsorted(older, value, side="left"))
+        return older.size + int(np.searchsorted(self._data[:self._head], value, side="left"))
+
+
+class GrowingBuffer:
+    """
+    Unbounded NumPy backed buffer, used instead of list when there is no limit of stored values.
+    Capacity grows by doubling, so appending is amortised O(1) and stored values are never copied into Python objects.
+    Data are only appended or dropped from the front, stored values are never overwritten in place,
+    therefore returned view stays valid until buffer is cleared or replaced.
+    Channels are stored the same way as in RingBuffer.
+    """
+    maxlen = None
+
+    def __init__(self, dtype: Any = np.float64, capacity: int = 1024, channels: Optional[int] = None) -> None:
+        """
+        :param dtype: NumPy dtype of stored values
+        :param int capacity: Initial capacity
+        :param int channels: Number of channels of every value, values are scalars if None
+        """
+        assert capacity > 0
+        assert channels is None or channels > 0
+        self.dtype = np.dtype(dtype)
+        self.channels = channels
+        self._data = np.empty(self._shape(int(capacity)), dtype=self.dtype)
+        # Index of the oldest value in data array, values before it were dropped
+        self._start = 0
+        self._size = 0
+
+    def _shape(self, length: int) -> Tuple[int, ...]:
+        return (length,) if self.channels is None else (self.channels, length)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += self._size
+            if not 0 <= index < self._size:
+                raise IndexError("GrowingBuffer index out of range")
+            return self._data[..., self._start + index]
+        return self.view()[..., index]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __array__(self, dtype: Optional[Any] = None, copy: Optional[bool] = None) -> np.ndarray:
+        data = self.view()
+        if dtype is not None and np.dtype(dtype) != data.dtype:
+            return data.astype(dtype)
+        return data
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[-1]
+
+    def _reserve(self, size: int) -> None:
+        """Make sure there is space for size values, dropped values are released by reallocation"""
+        if self._start + size > self.capacity:
+            new_data = np.empty(self._shape(max(size, 2 * self._size, 1024)), dtype=self.dtype)
+            new_data[..., :self._size] = self.view()
+            self._data = new_data
+            self._start = 0
+
+    def append(self, value: NUM) -> None:
+        """Append one value"""
+        self._reserve(self._size + 1)
+        self._data[..., self._start + self._size] = value
+        self._size += 1
+
+    def extend(self, values: Any) -> None:
+        """Append array of values using vectorised slice assignment"""
+        values = _as_items(values, self.channels)
+        count = values.shape[-1]
+        self._reserve(self._size + count)
+        end = self._start + self._size
+        self._data[..., end:end + count] = values
+        self._size += count
+
+    def replace(self, values: Any) -> None:
+        """Replace whole content of buffer, new array is allocated so previously returned views stay untouched"""
+        values = _as_items(values, self.channels)
+        count = values.shape[-1]
+        self._data = np.empty(self._shape(max(count, 1024)), dtype=self.dtype)
+        self._data[..., :count] = values
+        self._start = 0
+        self._size = count
+
+    def clear(self) -> None:
+        """Remove all values"""
+        self._data = np.empty(self._shape(1024), dtype=self.dtype)
+        self._start = 0
+        self._size = 0
+
+    def drop(self, count: int) -> None:
+        """Remove count oldest values"""
+        count = min(max(count, 0), self._size)
+        self._start += count
+        self._size -= count
+
+    def view(self) -> np.ndarray:
+        """Return view of stored values, from the oldest to the newest"""
+        return self._data[..., self._start:self._start + self._size]
+
+    def searchsorted(self, value: Any) -> int:
+        """Number of sorted values less than value, found by binary search"""
+        assert self.channels is None
+        return int(np.searchsorted(self.view(), value, side="left"))
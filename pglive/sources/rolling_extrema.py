@@ -0,0 +1,149 @@
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from pglive.sources.ring_buffer import _as_1d_array
+
+
+def _minimum_candidates(values: np.ndarray) -> np.ndarray:
+    """
+    Mask of values, that can become minimum of the window once all older values are evicted.
+    That are values strictly lower than all values after them, NaN values are never candidates.
+    """
+    mask = np.empty(values.size, dtype=np.bool_)
+    mask[-1] = True
+    if values.dtype.kind == "f":
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, np.inf)
+        suffix_min = np.minimum.accumulate(filled[::-1])[::-1]
+        # Value followed only by NaN values is a candidate even if it's inf
+        valid_after = np.logical_or.accumulate(valid[::-1])[::-1]
+        mask[:-1] = (filled[:-1] < suffix_min[1:]) | ~valid_after[1:]
+        mask &= valid
+    else:
+        suffix_min = np.minimum.accumulate(values[::-1])[::-1]
+        mask[:-1] = values[:-1] < suffix_min[1:]
+    return mask
+
+
+class _MonotonicQueue:
+    """
+    Queue of (index, value) pairs with values strictly increasing from front to back, front holds the minimum.
+    Pairs are stored in NumPy buffers, so even monotonic data don't create any Python objects and both
+    eviction from front and removal of dominated values from back are binary searches.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.indexes = np.empty(capacity, dtype=np.int64)
+        self.values: Optional[np.ndarray] = None
+        self.head = 0
+        self.tail = 0
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def clear(self) -> None:
+        self.head = self.tail = 0
+        self.values = None
+
+    def front(self) -> Any:
+        assert self.values is not None
+        return self.values[self.head]
+
+    def push(self, indexes: np.ndarray, values: np.ndarray) -> None:
+        """Push pairs with strictly increasing values, queued values greater or equal to the first are removed"""
+        if self.values is None:
+            self.values = np.empty(self.indexes.size, dtype=values.dtype)
+        elif values.dtype != self.values.dtype:
+            self.values = self.values.astype(np.promote_types(self.values.dtype, values.dtype))
+        self.tail = self.head + int(np.searchsorted(self.values[self.head:self.tail], values[0], "left"))
+        if self.tail + values.size > self.indexes.size:
+            self._compact(len(self) + values.size)
+        self.indexes[self.tail:self.tail + values.size] = indexes
+        self.values[self.tail:self.tail + values.size] = values
+        self.tail += values.size
+
+    def evict(self, oldest: int) -> None:
+        """Remove all pairs with index lower than oldest"""
+        self.head += int(np.searchsorted(self.indexes[self.head:self.tail], oldest, "left"))
+
+    def _compact(self, size: int) -> None:
+        """Move queued pairs to the beginning of buffers, buffers are reallocated if less than half is free"""
+        assert self.values is not None
+        length = len(self)
+        if 2 * size > self.indexes.size:
+            indexes = np.empty(2 * size, dtype=np.int64)
+            values = np.empty(2 * size, dtype=self.values.dtype)
+        else:
+            indexes, values = self.indexes, self.values
+        # Copy is required, because source and target slices may overlap
+        indexes[:length] = self.indexes[self.head:self.tail].copy()
+        values[:length] = self.values[self.head:self.tail].copy()
+        self.indexes, self.values = indexes, values
+        self.head, self.tail = 0, length
+
+
+class RollingExtrema:
+    """
+    Minimum and maximum of last window values, maintained incrementally by monotonic queues.
+    Append and eviction of old values are O(1) amortised, as is the bounds query.
+    NaN values are ignored the same way as by np.nanmin and np.nanmax.
+    """
+
+    def __init__(self, window: Optional[int] = None) -> None:
+        """
+        :param int window: Number of last values to track, all values are tracked if None
+        """
+        assert window is None or window > 0
+        self.window = window
+        # Number of values ever appended, used as index of the next value
+        self.count = 0
+        # Index of the oldest tracked value
+        self.first = 0
+        self._min = _MonotonicQueue()
+        # Maximum is tracked as minimum of negated values
+        self._max = _MonotonicQueue()
+
+    def clear(self) -> None:
+        self.count = 0
+        self.first = 0
+        self._min.clear()
+        self._max.clear()
+
+    def append(self, value: Any) -> None:
+        self.extend((value,))
+
+    def extend(self, values: Any) -> None:
+        values = _as_1d_array(values)
+        if values.size == 0:
+            return
+        if values.dtype.kind in "ub" or (values.dtype.kind == "i" and values.dtype.itemsize < 8):
+            # Make sure values can be negated, -int16(-32768) overflows
+            values = values.astype(np.int64)
+        start = self.count
+        self.count += values.size
+        if self.window is not None and values.size > self.window:
+            # Older values would be evicted immediately
+            start += values.size - self.window
+            values = values[-self.window:]
+        indexes = np.arange(start, start + values.size)
+        for queue, signed in ((self._min, values), (self._max, -values)):
+            mask = _minimum_candidates(signed)
+            if mask.any():
+                queue.push(indexes[mask], signed[mask])
+        if self.window is not None:
+            self.first = max(self.first, self.count - self.window)
+        self._min.evict(self.first)
+        self._max.evict(self.first)
+
+    def drop(self, count: int) -> None:
+        """Stop tracking count oldest values"""
+        self.first = min(self.first + max(count, 0), self.count)
+        self._min.evict(self.first)
+        self._max.evict(self.first)
+
+    def bounds(self) -> Tuple[Any, Any]:
+        """Return minimum and maximum of the window, NaN if there are no values or all values are NaN"""
+        if len(self._min) == 0:
+            return np.nan, np.nan
+        return self._min.front(), -self._max.front()
@@ -0,0 +1,191 @@
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from pyqtgraph.Qt import QtCore  # type: ignore
+
+from pglive.sources.ring_buffer import _as_1d_array
+
+# Header is one cache line of int64 values: published counter, capacity, dtype characters of y and x and
+# writing counter. Like a seqlock, writing counter is bumped before samples are written and published counter
+# after, they differ only while a write is in progress.
+_HEADER = 8
+_COUNTER, _CAPACITY, _DTYPE, _X_DTYPE, _WRITING = 0, 1, 2, 3, 4
+
+
+def _aligned(size: int) -> int:
+    """Round size up to multiple of 8 bytes, so x ring is aligned even after narrow y ring"""
+    return (size + 7) // 8 * 8
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to existing shared memory block, which must not be removed when this process exits"""
+    shared_memory = SharedMemory(name=name)
+    try:
+        # Resource tracker removes all shared memory blocks used by exiting process, even attached ones
+        resource_tracker.unregister(shared_memory._name, "shared_memory")  # type: ignore
+    except Exception:
+        pass
+    return shared_memory
+
+
+class _SharedRing:
+    """Ring buffer of x and y in shared memory block, laid out as header, y ring and x ring"""
+
+    def __init__(self, shared_memory: SharedMemory) -> None:
+        self.shared_memory = shared_memory
+        self.header: np.ndarray = np.ndarray((_HEADER,), dtype=np.int64, buffer=shared_memory.buf)
+        self.capacity = int(self.header[_CAPACITY])
+        self.dtype = np.dtype(chr(int(self.header[_DTYPE])))
+        self.x_dtype = np.dtype(chr(int(self.header[_X_DTYPE])))
+        offset = self.header.nbytes
+        self.y: np.ndarray = np.ndarray((self.capacity,), dtype=self.dtype, buffer=shared_memory.buf, offset=offset)
+        self.x: np.ndarray = np.ndarray((self.capacity,), dtype=self.x_dtype, buffer=shared_memory.buf,
+                            offset=offset + _aligned(self.y.nbytes))
+
+    @property
+    def name(self) -> str:
+        return self.shared_memory.name
+
+    @property
+    def count(self) -> int:
+        """Number of samples ever written and published"""
+        return int(self.header[_COUNTER])
+
+    @property
+    def writing(self) -> int:
+        """Number of samples ever written, including samples of write in progress"""
+        return int(self.header[_WRITING])
+
+    def close(self) -> None:
+        # Views must be released before shared memory is closed
+        del self.header, self.y, self.x
+        self.shared_memory.close()
+
+
+class SharedRingProducer(_SharedRing):
+    """
+    Single producer of lock-free ring buffer in multiprocessing.shared_memory.
+    Writing counter is bumped before samples are written into the ring and the published counter afterward,
+    so consumer never reads samples being written and detects samples overwritten while it was copying them.
+    Producer never waits for consumer, if consumer doesn't keep up, oldest unread samples are overwritten.
+    """
+
+    def __init__(self, capacity: int = 2 ** 20, dtype: Any = np.float64, name: Optional[str] = None,
+                 create: bool = True, x_dtype: Optional[Any] = None) -> None:
+        """
+        :param int capacity: Number of samples in the ring
+        :param dtype: NumPy dtype of y
+        :param str name: Name of shared memory block, random name is used if None
+        :param bool create: Create new shared memory block, otherwise attach to existing block by name,
+                            capacity and dtype of the existing ring are used
+        :param x_dtype: NumPy dtype of x, same as dtype if None
+        """
+        if not create:
+            assert name is not None
+            super().__init__(_attach(name))
+            return
+        assert capacity > 0
+        dtype = np.dtype(dtype)
+        x_dtype = dtype if x_dtype is None else np.dtype(x_dtype)
+        size = _HEADER * 8 + _aligned(capacity * dtype.itemsize) + capacity * x_dtype.itemsize
+        shared_memory = SharedMemory(name=name, create=True, size=size)
+        header: np.ndarray = np.ndarray((_HEADER,), dtype=np.int64, buffer=shared_memory.buf)
+        header[:] = 0
+        header[_CAPACITY] = capacity
+        header[_DTYPE] = ord(dtype.char)
+        header[_X_DTYPE] = ord(x_dtype.char)
+        del header
+        super().__init__(shared_memory)
+
+    def append(self, y: Any, x: Optional[Any] = None) -> None:
+        self.extend((y,), None if x is None else (x,))
+
+    def extend(self, y: Any, x: Optional[Any] = None) -> None:
+        """Write samples into the ring, x is index of sample if None"""
+        y = _as_1d_array(y)
+        count = self.count
+        x = np.arange(count, count + y.size) if x is None else _as_1d_array(x)
+        if y.size > self.capacity:
+            # Older samples would be overwritten immediately
+            count += y.size - self.capacity
+            y, x = y[-self.capacity:], x[-self.capacity:]
+        # Announce write, slots of samples older than capacity behind the new count are going to be overwritten
+        self.header[_WRITING] = count + y.size
+        start = count % self.capacity
+        first = min(y.size, self.capacity - start)
+        self.y[start:start + first] = y[:first]
+        self.x[start:start + first] = x[:first]
+        self.y[:y.size - first] = y[first:]
+        self.x[:y.size - first] = x[first:]
+        # Publish samples only after they are written
+        self.header[_COUNTER] = count + y.size
+
+    def unlink(self) -> None:
+        """Close and remove shared memory block, call in the process which created it"""
+        self.close()
+        # Consumer in the same process, or its forked child, might have unregistered the block already,
+        # unlink expects it to be registered
+        resource_tracker.register(self.shared_memory._name, "shared_memory")  # type: ignore
+        self.shared_memory.unlink()
+
+
+class SharedRingConsumer(QtCore.QObject):
+    """
+    Consumer of SharedRingProducer feeding DataConnector in the GUI process.
+    New samples are found by the published counter and copied once as the final slice into cb_append_data_array,
+    nothing is pickled. Writing counter is read again after the copy, samples overwritten before or while they were
+    read are dropped and counted in dropped_samples, so torn data are never appended.
+    """
+
+    def __init__(self, name: str, data_connector: Any, poll_rate: Optional[float] = 100.) -> None:
+        """
+        :param str name: Name of shared memory block of SharedRingProducer
+        :param data_connector: DataConnector fed by new samples
+        :param float poll_rate: Rate of polling for new samples in Hz, call poll manually if None
+        """
+        super().__init__()
+        self.ring = _SharedRing(_attach(name))
+        self.data_connector = data_connector
+        # Start with samples written from now on
+        self.position = self.ring.count
+        self.dropped_samples = 0
+        self.timer: Optional[QtCore.QTimer] = None
+        if poll_rate is not None:
+            self.timer = QtCore.QTimer(self)
+            self.timer.timeout.connect(self.poll)
+            self.timer.start(max(1, int(1000 / poll_rate)))
+
+    def _read(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy samples [start, stop) out of the ring"""
+        capacity = self.ring.capacity
+        first, last = start % capacity, (stop - 1) % capacity + 1
+        if first < last:
+            return self.ring.y[first:last].copy(), self.ring.x[first:last].copy()
+        return (np.concatenate((self.ring.y[first:], self.ring.y[:last])),
+                np.concatenate((self.ring.x[first:], self.ring.x[:last])))
+
+    def poll(self) -> int:
+        """Append all new samples into DataConnector, return number of appended samples"""
+        count = self.ring.count
+        start = max(self.position, count - self.ring.capacity)
+        self.dropped_samples += start - self.position
+        self.position = count
+        if start >= count:
+            return 0
+        y, x = self._read(start, count)
+        # Producer may have started overwriting the oldest samples while they were copied
+        overwritten = self.ring.writing - self.ring.capacity - start
+        if overwritten > 0:
+            y, x = y[overwritten:], x[overwritten:]
+            self.dropped_samples += min(overwritten, count - start)
+        if y.size > 0:
+            self.data_connector.cb_append_data_array(y, x)
+        return y.size
+
+    def close(self) -> None:
+        """Stop polling and detach from shared memory"""
+        if self.timer is not None:
+            self.timer.stop()
+        self.ring.close()
@@ -0,0 +1,126 @@
+import time
+from typing import NamedTuple, Any
+
+
+class TimingSnapshot(NamedTuple):
+    """Accumulated duration of repeated operation in seconds"""
+    calls: int
+    total: float
+    mean: float
+    max: float
+
+
+class Timing:
+    """Accumulates duration of repeated operation"""
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.
+        self.max = 0.
+
+    def add(self, duration: float) -> None:
+        self.calls += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def snapshot(self) -> TimingSnapshot:
+        return TimingSnapshot(self.calls, self.total, self.total / self.calls if self.calls else 0., self.max)
+
+
+class ConnectorStatsSnapshot(NamedTuple):
+    """Performance of DataConnector measured during duration seconds"""
+    duration: float
+    # Samples written into DataConnector and ingest rate in samples per second
+    samples_ingested: int
+    ingest_rate: float
+    # Frames emitted to plot and frame rate in Hz
+    frames_emitted: int
+    frame_rate: float
+    # Samples skipped because of update_rate
+    samples_skipped: int
+    # Samples dropped because data_lock was held by other thread
+    samples_dropped: int
+    # Frames skipped because of plot_rate
+    frames_skipped: int
+    lock_wait: TimingSnapshot
+    slot_new_data: TimingSnapshot
+    range: TimingSnapshot
+    paint: TimingSnapshot
+
+
+class WidgetStatsSnapshot(NamedTuple):
+    """Performance of LivePlotWidget measured during duration seconds"""
+    duration: float
+    # View range updates and their rate in Hz
+    range_updates: int
+    range_update_rate: float
+    range: TimingSnapshot
+    paint: TimingSnapshot
+
+
+class _Stats:
+    # Interval of stats signal emission in seconds
+    interval: float = 1.
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters"""
+        self.started = time.perf_counter()
+
+    def emit_due(self) -> bool:
+        """Return True if interval elapsed since last reset"""
+        return time.perf_counter() - self.started >= self.interval
+
+
+class ConnectorStats(_Stats):
+    """Performance counters of DataConnector"""
+
+    def reset(self) -> None:
+        super().reset()
+        self.samples_ingested = 0
+        self.frames_emitted = 0
+        self.samples_skipped = 0
+        self.samples_dropped = 0
+        self.frames_skipped = 0
+        self.lock_wait = Timing()
+        self.slot_new_data = Timing()
+        self.range = Timing()
+        self.paint = Timing()
+
+    def snapshot(self) -> ConnectorStatsSnapshot:
+        duration = time.perf_counter() - self.started
+        return ConnectorStatsSnapshot(duration, self.samples_ingested, self.samples_ingested / duration,
+                                      self.frames_emitted, self.frames_emitted / duration, self.samples_skipped,
+                                      self.samples_dropped, self.frames_skipped, self.lock_wait.snapshot(),
+                                      self.slot_new_data.snapshot(), self.range.snapshot(), self.paint.snapshot())
+
+
+class WidgetStats(_Stats):
+    """Performance counters of LivePlotWidget"""
+
+    def reset(self) -> None:
+        super().reset()
+        self.range_updates = 0
+        self.range = Timing()
+        self.paint = Timing()
+
+    def snapshot(self) -> WidgetStatsSnapshot:
+        duration = time.perf_counter() - self.started
+        return WidgetStatsSnapshot(duration, self.range_updates, self.range_updates / duration,
+                                   self.range.snapshot(), self.paint.snapshot())
+
+
+def time_paint(item: Any, stats: ConnectorStats) -> None:
+    """Measure paint duration of graphics item and all its child items"""
+    for graphics_item in (item, *item.childItems()):
+        def paint(*args: Any, _paint=graphics_item.paint) -> None:
+            start = time.perf_counter()
+            _paint(*args)
+            # Paint timing is replaced on every reset of stats
+            stats.paint.add(time.perf_counter() - start)
+
+        graphics_item.paint = paint
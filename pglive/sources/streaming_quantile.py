@@ -0,0 +1,156 @@
+import math
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from pglive.sources.ring_buffer import _as_1d_array
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch (merging t-digest).
+    Values are summarized by centroids of mean and weight. Centroids are small near both ends of the distribution
+    and single values in the tails, so extreme quantiles are accurate in rank, regardless of offset or scale of data.
+    Outliers stay in their own centroids and don't move quantiles the way they move minimum and maximum.
+    Values are buffered and merged into centroids by one sort once buffer is full.
+    """
+
+    def __init__(self, compression: float = 200) -> None:
+        """
+        :param float compression: Limits number of centroids, higher compression keeps more of them and is more accurate
+        """
+        assert compression > 0
+        self.compression = compression
+        self._buffer_size = int(5 * compression)
+        # Centroids sorted by mean, replaced at once, so they can be read without lock
+        self._centroids: Tuple[np.ndarray, np.ndarray] = (np.empty(0), np.empty(0))
+        # Values not merged into centroids yet, single values and arrays
+        self._values: List[float] = []
+        self._arrays: List[np.ndarray] = []
+        self._buffered = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add one value, NaN values are ignored"""
+        if value != value:
+            return
+        self._values.append(value)
+        self._counted(1)
+
+    def extend(self, values: Any) -> None:
+        """Add array of values, NaN values are ignored"""
+        values = _as_1d_array(values).astype(np.float64)
+        values = values[~np.isnan(values)]
+        if values.size > 0:
+            self._arrays.append(values)
+            self._counted(values.size)
+
+    def _counted(self, size: int) -> None:
+        self.count += size
+        self._buffered += size
+        if self._buffered >= self._buffer_size:
+            self._centroids = self._merged(self._values, self._arrays)
+            self._values, self._arrays, self._buffered = [], [], 0
+
+    def _merged(self, values: List[float], arrays: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge buffered values into centroids, centroids span at most one unit of scale function"""
+        means, weights = self._centroids
+        buffered = np.concatenate([np.asarray(values, dtype=np.float64), *arrays])
+        if buffered.size == 0:
+            return means, weights
+        means = np.concatenate((means, buffered))
+        weights = np.concatenate((weights, np.ones(buffered.size)))
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        # Logarithmic scale function of quantile at the end of every value, centroid size is proportional to
+        # min(q, 1 - q), so the first and the last values stay single and outliers aren't averaged with data
+        total = weights.sum()
+        q = np.clip(np.cumsum(weights) / total, 0.5 / total, 1 - 0.5 / total)
+        normalizer = 4 * math.log(max(total / self.compression, 1)) + 24
+        k = self.compression / normalizer * np.log(q / (1 - q))
+        groups = np.floor(k - k[0]).astype(np.intp)
+        merged_weights = np.bincount(groups, weights=weights)
+        merged_means = np.bincount(groups, weights=weights * means)
+        used = merged_weights > 0
+        return merged_means[used] / merged_weights[used], merged_weights[used]
+
+    def quantiles(self, *quantiles: float) -> Tuple[float, ...]:
+        """Return estimated quantiles of the nearest rank, NaN if there are no values"""
+        means, weights = self._merged(list(self._values), list(self._arrays))
+        count = weights.sum()
+        if count == 0:
+            return tuple(math.nan for _ in quantiles)
+        # Rank of centroid center, single values have integer rank
+        centers = np.cumsum(weights) - weights / 2 - 0.5
+        # Nearest rank, so quantile of single values isn't interpolated towards an outlier
+        ranks = np.round(np.asarray(quantiles) * (count - 1))
+        return tuple(float(value) for value in np.interp(ranks, centers, means))
+
+
+class QuantileRange:
+    """
+    Low and high quantile of last window values, e.g. 0.1 and 99.9 percentile, for outlier-robust range.
+    Sketches don't know which values are evicted, therefore two generations of sketches are kept. New generation
+    starts every half of window and replaces the old one, so reported quantiles cover last half to full window.
+    """
+
+    def __init__(self, low: float = 0.001, high: float = 0.999, window: Optional[int] = None,
+                 compression: float = 200) -> None:
+        """
+        :param float low: Low quantile
+        :param float high: High quantile
+        :param int window: Number of last values to track, all values are tracked if None
+        :param float compression: Compression of quantile sketches
+        """
+        assert 0 <= low < high <= 1
+        assert window is None or window > 1
+        self.low = low
+        self.high = high
+        self.window = window
+        self.compression = compression
+        self.clear()
+
+    def clear(self) -> None:
+        # Number of values added into the current generation
+        self.count = 0
+        self._current = QuantileSketch(self.compression)
+        self._next: Optional[QuantileSketch] = None
+
+    def append(self, value: Any) -> None:
+        value = float(value)
+        self._current.add(value)
+        if self._next is not None:
+            self._next.add(value)
+        self._counted(1)
+
+    def extend(self, values: Any) -> None:
+        values = _as_1d_array(values)
+        while values.size > 0:
+            # Split values at the next change of generations
+            size = values.size if self.window is None else min(values.size, self._until_change())
+            part, values = values[:size], values[size:]
+            self._current.extend(part)
+            if self._next is not None:
+                self._next.extend(part)
+            self._counted(size)
+
+    def _until_change(self) -> int:
+        """Number of values until next generation starts or replaces the current one"""
+        assert self.window is not None
+        return (self.window if self._next is not None else self.window // 2) - self.count
+
+    def _counted(self, size: int) -> None:
+        self.count += size
+        if self.window is None:
+            return
+        if self.count >= self.window:
+            # Next generation has the last half of window
+            self._current, self._next = self._next or self._current, None
+            self.count = self.window - self.window // 2
+        if self._next is None and self.count >= self.window // 2:
+            self._next = QuantileSketch(self.compression)
+
+    def bounds(self) -> Tuple[float, float]:
+        """Return low and high quantile, NaN if there are no values"""
+        low, high = self._current.quantiles(self.low, self.high)
+        return low, high
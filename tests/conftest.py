@@ -0,0 +1,35 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest  # noqa: E402
+from pyqtgraph.Qt import QtWidgets  # noqa: E402
+
+from pglive.sources.data_connector import DataConnector  # noqa: E402
+from pglive.sources.live_plot import LiveLinePlot  # noqa: E402
+from pglive.sources.live_plot_widget import LivePlotWidget  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def make_connector(qapp):
+    """
+    Factory of DataConnector of plot added into plot widget, new LivePlotWidget is created if plot_widget is None.
+    Widgets are kept alive until the test ends, plot widget of connector is data_connector.plot.plot_widget.
+    """
+    plot_widgets = []
+
+    def factory(plot=None, plot_widget=None, **kwargs):
+        if plot_widget is None:
+            plot_widget = LivePlotWidget()
+        plot_widgets.append(plot_widget)
+        plot = LiveLinePlot() if plot is None else plot
+        plot_widget.addItem(plot)
+        return DataConnector(plot, **kwargs)
+
+    yield factory
+    plot_widgets.clear()
@@ -0,0 +1,27 @@
+from pglive.sources.async_feeder import AsyncFeeder
+
+
+def test_points_with_and_without_x_keep_explicit_x(qapp, make_connector):
+    data_connector = make_connector(max_points=100, ring_buffer=True)
+    feeder = AsyncFeeder()
+    feeder.put_point(data_connector, 1., 100)
+    feeder.put_point(data_connector, 2., None)
+    feeder.put_point(data_connector, 3., None)
+    feeder.flush()
+    qapp.processEvents()
+    assert list(data_connector.x) == [100., 101., 102.]
+    assert list(data_connector.y) == [1., 2., 3.]
+
+
+def test_flush_appends_once_per_connector(qapp, make_connector):
+    data_connector = make_connector(max_points=100, ring_buffer=True, update_rate=1)
+    feeder = AsyncFeeder()
+    feeder.put_array(data_connector, [1., 2.])
+    feeder.put_point(data_connector, 3., 10)
+    feeder.put_point(data_connector, 4., None)
+    feeder.put_array(data_connector, [5.], [20])
+    feeder.flush()
+    qapp.processEvents()
+    # Second append would be dropped by update_rate
+    assert list(data_connector.x) == [0., 1., 10., 11., 20.]
+    assert list(data_connector.y) == [1., 2., 3., 4., 5.]
@@ -0,0 +1,22 @@
+import pytest
+
+from pglive.sources.connector_group import ConnectorGroup
+
+
+def test_rejects_connectors_outside_of_group(make_connector):
+    member, other = make_connector(max_points=100), make_connector(max_points=100)
+    group = ConnectorGroup([member])
+    with pytest.raises(ValueError):
+        group.cb_append_data_point({member: 1., other: 2.}, x=0)
+    assert len(other.x) == 0
+
+
+def test_staged_data_are_written_before_group_data(qapp, make_connector):
+    data_connector = make_connector(max_points=100, lossless=True)
+    group = ConnectorGroup([data_connector])
+    # Staged while group is holding data_lock
+    data_connector._staging.append((data_connector._append_point, 1., 1., {}))
+    group.cb_append_data_point([2.], x=2)
+    qapp.processEvents()
+    assert list(data_connector.x) == [1., 2.]
+    assert data_connector.rolling_index == 2
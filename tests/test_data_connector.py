@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+
+def test_lossless_drains_when_lock_is_released(qapp, make_connector):
+    data_connector = make_connector(max_points=100, lossless=True)
+    with data_connector.data_lock:
+        for value in range(10):
+            data_connector.cb_append_data_point(value, value)
+        assert len(data_connector.x) == 0
+    qapp.processEvents()
+    assert list(data_connector.y) == list(range(10))
+    assert data_connector.rolling_index == 10
+
+
+def test_unlimited_storage_keeps_set_ndarray(make_connector):
+    data_connector = make_connector()
+    y = np.arange(1000, dtype=float)
+    data_connector.cb_set_data(y)
+    assert data_connector.y is y
+    assert isinstance(data_connector.x, np.ndarray)
+    data_connector.cb_append_data_array(np.array([1000., 1001.]))
+    data_connector.cb_append_data_point(1002.)
+    assert list(data_connector.x[-3:]) == [1000, 1001, 1002]
+    assert data_connector.y[-1] == 1002.
+    data_connector.cb_set_data(y)
+    data_connector.clear()
+    assert len(data_connector.x) == 0 and len(data_connector.y) == 0
+
+
+def test_x_sorted_is_tracked_on_write(make_connector):
+    data_connector = make_connector(max_points=100, ring_buffer=True)
+    data_connector.cb_append_data_array(np.zeros(3), np.array([0., 1., 2.]))
+    data_connector.cb_append_data_point(0., 2.)
+    assert data_connector.x_sorted
+    data_connector.cb_append_data_point(0., 1.)
+    assert not data_connector.x_sorted
+    data_connector.cb_set_data(np.zeros(3), np.array([5., 6., 7.]))
+    assert data_connector.x_sorted
+    data_connector.cb_append_data_array(np.zeros(2), np.array([9., 8.]))
+    assert not data_connector.x_sorted
+    data_connector.clear()
+    assert data_connector.x_sorted
+
+
+def test_trackers_get_stored_values(make_connector):
+    data_connector = make_connector(max_points=100, dtype=np.int16, track_bounds=True, range_index=True)
+    data_connector.cb_append_data_array(np.array([1.7, -2.9, 3.7]))
+    data_connector.cb_append_data_point(4.9)
+    assert list(data_connector.y) == [1, -2, 3, 4]
+    assert data_connector.y_extrema.bounds() == (-2, 4)
+    assert data_connector.tail_bounds(1) == (-2, 4)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"max_points": 1000}, {"max_points": 1000, "ring_buffer": True}])
+def test_max_age_drops_old_samples(make_connector, kwargs):
+    data_connector = make_connector(max_age=10, range_index=True, **kwargs)
+    data_connector.cb_append_data_array(np.arange(50.), np.arange(50.))
+    for value in range(50, 100):
+        data_connector.cb_append_data_point(float(value), float(value))
+    assert list(data_connector.x) == list(range(89, 100))
+    assert list(data_connector.y) == list(range(89, 100))
+    assert data_connector.y_index.bounds(0, data_connector.y_index.count) == (89, 99)
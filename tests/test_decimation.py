@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from pglive.sources.decimation import is_sorted, lttb, m4
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.int64])
+def test_m4_keeps_endpoints_and_extrema_of_every_bin(dtype):
+    rng = np.random.default_rng(0)
+    x = np.cumsum(rng.integers(1, 4, 10000)).astype(dtype)
+    y = rng.normal(size=x.size)
+    bin_width = 50
+    dx, dy = m4(x, y, bin_width)
+    assert dx.size < x.size
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    assert dy[0] == y[0] and dy[-1] == y[-1]
+    assert is_sorted(dx)
+    numbers = (x - x[0]) // bin_width
+    decimated_numbers = (dx - x[0]) // bin_width
+    for number in np.unique(numbers):
+        raw, kept = y[numbers == number], dy[decimated_numbers == number]
+        assert kept.min() == raw.min() and kept.max() == raw.max()
+        assert kept[0] == raw[0] and kept[-1] == raw[-1]
+
+
+def test_m4_ignores_nan():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 10)
+    y[::7] = np.nan
+    dx, dy = m4(x, y, 100)
+    assert np.nanmin(dy) == np.nanmin(y) and np.nanmax(dy) == np.nanmax(y)
+
+
+def test_m4_without_gain_returns_input():
+    x, y = np.arange(10.), np.arange(10.)
+    dx, dy = m4(x, y, 0.5)
+    assert dx is x and dy is y
+
+
+def test_lttb_keeps_endpoints_and_point_count():
+    rng = np.random.default_rng(1)
+    x = rng.random(5000)
+    y = rng.normal(size=x.size)
+    y[100] = 50
+    y[4000] = -50
+    dx, dy = lttb(x, y, 200)
+    assert dx.size == dy.size == 200
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    assert dy[0] == y[0] and dy[-1] == y[-1]
+    # Outliers form the largest triangles of their buckets
+    assert 50 in dy and -50 in dy
+
+
+def test_lttb_skips_nan():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.cos(x / 20)
+    y[1::3] = np.nan
+    dx, dy = lttb(x, y, 100)
+    assert not np.isnan(dy).any()
+    assert np.all(np.diff(dx) > 0)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from pglive.sources.history_store import HistoryStore
+
+
+def test_read_reduces_every_chunk(tmp_path):
+    history = HistoryStore(str(tmp_path), chunk_size=1000)
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 100)
+    y[4321] = 50
+    history.extend(y, x)
+    reduced_y, reduced_x = history.read(0, len(history), bin_width=100)
+    # At most first, min, max and last sample of every bin
+    assert reduced_x.size <= 4 * 100
+    assert np.all(np.diff(reduced_x) > 0)
+    assert reduced_y.max() == 50 and reduced_y.min() == y.min()
+    full_y, full_x = history.read(0, len(history))
+    assert np.array_equal(full_x, x) and np.array_equal(full_y, y)
+
+
+def test_generation_changes_on_replace_and_clear(tmp_path):
+    history = HistoryStore(str(tmp_path), chunk_size=10)
+    history.extend(np.ones(5), np.arange(5))
+    generation = history.generation
+    history.extend(np.ones(5), np.arange(5, 10))
+    assert history.generation == generation
+    history.replace(np.zeros(5), np.arange(5))
+    assert history.generation > generation
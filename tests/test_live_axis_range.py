@@ -0,0 +1,62 @@
+import math
+
+from pglive.sources.live_axis_range import LiveAxisRange, _nice_range, _RangeAggregate
+
+
+def test_range_aggregate_add_replace_remove():
+    aggregate = _RangeAggregate()
+    assert aggregate.bounds() is None
+    aggregate.set(1, [0, 10])
+    aggregate.set(2, [-5, 3])
+    assert aggregate.bounds() == [-5, 10]
+    aggregate.set(2, [1, 20])
+    assert aggregate.bounds() == [0, 20]
+    aggregate.discard(2)
+    assert aggregate.bounds() == [0, 10]
+    aggregate.set(3, [math.nan, 15])
+    assert aggregate.bounds() == [0, 15]
+    aggregate.discard(1)
+    lower, upper = aggregate.bounds()
+    assert math.isnan(lower) and upper == 15
+    aggregate.discard(3)
+    assert aggregate.bounds() is None and len(aggregate) == 0
+
+
+def test_range_aggregate_many_updates():
+    aggregate = _RangeAggregate()
+    for value in range(1000):
+        aggregate.set(value % 10, [value, value + 1])
+    assert aggregate.bounds() == [990, 1000]
+    assert len(aggregate._lower) <= 4 * len(aggregate) + 64
+
+
+def test_nice_range():
+    assert _nice_range(0.3, 9.6) == [0, 10]
+    assert _nice_range(-13, 87) == [-20, 90]
+    assert _nice_range(1, 1) == [1, 1]
+
+
+def test_hysteresis_holds_until_shrink_ratio_is_crossed():
+    axis_range = LiveAxisRange(y_shrink_ratio=0.5)
+    assert axis_range._hold_y_range([0, 10]) == [0, 10]
+    # Range inside held range is kept until its width drops below half of held width
+    assert axis_range._hold_y_range([2, 8]) == [0, 10]
+    assert axis_range._hold_y_range([4, 9]) == [0, 10]
+    assert axis_range._hold_y_range([4, 8]) == [4, 8]
+    # Expansion is immediate and keeps the held range
+    assert axis_range._hold_y_range([5, 12]) == [4, 12]
+
+
+def test_hysteresis_shrinks_after_delay():
+    axis_range = LiveAxisRange(y_shrink_ratio=0.5, y_shrink_delay=60)
+    axis_range._hold_y_range([0, 10])
+    assert axis_range._hold_y_range([4, 5]) == [0, 10]
+    axis_range._y_shrink_since -= 60
+    assert axis_range._hold_y_range([4, 5]) == [4, 5]
+
+
+def test_nice_range_is_held():
+    axis_range = LiveAxisRange(y_nice_range=True)
+    assert axis_range._hold_y_range([0.3, 9.6]) == [0, 10]
+    assert axis_range._hold_y_range([0.5, 9.1]) == [0, 10]
+    assert axis_range._hold_y_range([0.5, 19]) == [0, 20]
@@ -0,0 +1,45 @@
+import numpy as np
+
+from pglive.sources.lod_pyramid import LodPyramid
+from pglive.sources.ring_buffer import GrowingBuffer
+
+
+def make_pyramid(size, factor=4):
+    rng = np.random.default_rng(0)
+    x, y = GrowingBuffer(), GrowingBuffer()
+    pyramid = LodPyramid(x, y, factor)
+    raw_y = rng.normal(size=size)
+    # Append in uneven chunks, so blocks are aggregated incrementally
+    for start in range(0, size, 333):
+        x.extend(np.arange(start, min(start + 333, size), dtype=np.float64))
+        y.extend(raw_y[start:start + 333])
+        pyramid.update()
+    return pyramid, raw_y
+
+
+def test_levels_hold_min_max_of_blocks():
+    factor = 4
+    pyramid, raw_y = make_pyramid(10000, factor)
+    assert len(pyramid.levels) == 6
+    for index, level in enumerate(pyramid.levels):
+        block = factor ** (index + 1)
+        blocks = len(raw_y) // block
+        assert len(level) == blocks
+        raw = raw_y[:blocks * block].reshape(blocks, block)
+        np.testing.assert_array_equal(level.lo.view(), raw.min(axis=1))
+        np.testing.assert_array_equal(level.hi.view(), raw.max(axis=1))
+        np.testing.assert_array_equal(level.min_first.view(), raw.argmin(axis=1) < raw.argmax(axis=1))
+        np.testing.assert_array_equal(level.x_start.view(), np.arange(blocks) * block)
+        np.testing.assert_array_equal(level.x_end.view(), np.arange(blocks) * block + block - 1)
+
+
+def test_query_is_bounded_by_pixels_and_keeps_extrema():
+    pyramid, raw_y = make_pyramid(10000)
+    x, y = pyramid.query(0, 9999, 100)
+    assert x.size <= 4 * 100
+    assert y.min() == raw_y.min() and y.max() == raw_y.max()
+    assert np.all(np.diff(x) >= 0)
+    # Narrow view returns raw samples
+    x, y = pyramid.query(1000, 1050, 100)
+    np.testing.assert_array_equal(x, np.arange(999, 1052))
+    np.testing.assert_array_equal(y, raw_y[999:1052])
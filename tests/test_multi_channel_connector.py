@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from pglive.sources.live_plot import LiveLinePlot
+from pglive.sources.live_plot_widget import LivePlotWidget
+from pglive.sources.multi_channel_connector import MultiChannelConnector
+
+
+@pytest.fixture
+def plot_widget(qapp):
+    return LivePlotWidget()
+
+
+@pytest.mark.parametrize("max_points,mirrored", [(np.inf, False), (5, False), (5, True)])
+def test_channel_shapes(plot_widget, max_points, mirrored):
+    plots = [LiveLinePlot() for _ in range(3)]
+    for plot in plots:
+        plot_widget.addItem(plot)
+    connector = MultiChannelConnector(plots, max_points=max_points, mirrored=mirrored)
+    connector.cb_append_data_array(np.arange(12).reshape(3, 4))
+    connector.cb_append_data_point([100, 101, 102])
+    samples = min(5, max_points)
+    assert connector.y.view().shape == (3, samples)
+    assert list(connector.x) == list(range(5 - samples, 5))
+    for index, channel in enumerate(connector.channel_connectors):
+        assert channel.y.shape == (samples,)
+        assert list(channel.y) == ([4 * index + value for value in range(4)] + [100 + index])[-samples:]
+        y, x = channel._data_arrays()
+        assert y.shape == x.shape == (samples,)
+    with pytest.raises(ValueError):
+        connector.cb_append_data_array(np.zeros((3, 2)), [1., 2., 3.])
+    connector.cb_set_data(np.ones((3, 2)))
+    assert connector.y.view().shape == (3, 2)
+    connector.clear()
+    assert connector.y.view().shape == (3, 0)
@@ -0,0 +1,28 @@
+from math import inf
+
+import numpy as np
+
+from pglive.sources.recorder import StreamRecorder, StreamReplay
+
+
+def test_record_and_replay_round_trip(make_connector, tmp_path):
+    path = str(tmp_path / "stream.rec")
+    source = make_connector(max_points=100)
+    with StreamRecorder(source, path) as recorder:
+        source.cb_set_data([1., 2., 3.], [0., 1., 2.])
+        source.cb_append_data_point(4., 3.)
+        source.cb_append_data_array(np.array([5., 6.]), np.array([4., 5.]))
+        source.cb_append_data_point(7.)
+    assert recorder.records == 4
+    # Methods of connector are restored
+    assert "cb_append_data_point" not in vars(source)
+
+    records = list(StreamReplay(path))
+    assert [record[1] for record in records] == ["cb_set_data", "cb_append_data_point",
+                                                 "cb_append_data_array", "cb_append_data_point"]
+    assert all(earlier[0] <= later[0] for earlier, later in zip(records, records[1:]))
+
+    target = make_connector(max_points=100)
+    assert StreamReplay(path).replay(target, speed=inf) == 4
+    assert list(target.x) == list(source.x)
+    assert list(target.y) == list(source.y)
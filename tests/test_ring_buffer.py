@@ -0,0 +1,74 @@
+import numpy as np
+
+from pglive.sources.ring_buffer import GrowingBuffer, RingBuffer
+
+
+def test_mirrored_view_is_not_overwritten():
+    ring_buffer = RingBuffer(10, mirrored=True, headroom=5)
+    ring_buffer.extend(np.arange(10))
+    view = ring_buffer.view()
+    data = ring_buffer._data
+    # Headroom writes don't touch the view
+    ring_buffer.extend(np.arange(10, 15))
+    assert ring_buffer._data is data
+    assert list(view) == list(range(10))
+    view = ring_buffer.view()
+    for value in range(15, 21):
+        ring_buffer.append(value)
+    assert ring_buffer._data is not data
+    assert list(view) == list(range(5, 15))
+    assert list(ring_buffer.view()) == list(range(11, 21))
+
+
+def test_searchsorted_in_wrapped_ring():
+    for mirrored in (False, True):
+        ring_buffer = RingBuffer(10, mirrored=mirrored)
+        ring_buffer.extend(np.arange(25.))
+        values = np.arange(15., 25.)
+        for value in (0., 15., 17.5, 19., 20., 24., 30.):
+            assert ring_buffer.searchsorted(value) == np.searchsorted(values, value)
+
+
+def test_ring_buffer_keeps_last_capacity_values():
+    for mirrored in (False, True):
+        ring_buffer = RingBuffer(5, mirrored=mirrored)
+        ring_buffer.extend([0, 1, 2])
+        for value in range(3, 8):
+            ring_buffer.append(value)
+        assert len(ring_buffer) == 5
+        assert list(ring_buffer.view()) == [3, 4, 5, 6, 7]
+        assert ring_buffer[0] == 3 and ring_buffer[-1] == 7
+        # Array longer than capacity keeps only its tail
+        ring_buffer.extend(np.arange(10, 22))
+        assert list(ring_buffer.view()) == [17, 18, 19, 20, 21]
+        ring_buffer.drop(2)
+        assert list(ring_buffer.view()) == [19, 20, 21]
+        ring_buffer.replace([1, 2])
+        assert list(np.asarray(ring_buffer)) == [1, 2]
+
+
+def test_mirrored_view_is_contiguous_without_copy():
+    ring_buffer = RingBuffer(4, mirrored=True)
+    ring_buffer.extend(np.arange(7))
+    view = ring_buffer.view()
+    assert list(view) == [3, 4, 5, 6]
+    assert view.base is ring_buffer._data or view.base is ring_buffer._data.base
+
+
+def test_channels_view():
+    ring_buffer = RingBuffer(3, channels=2)
+    ring_buffer.extend([[0, 1, 2, 3], [10, 11, 12, 13]])
+    ring_buffer.append([4, 14])
+    assert ring_buffer.view().shape == (2, 3)
+    assert ring_buffer.view().tolist() == [[2, 3, 4], [12, 13, 14]]
+
+
+def test_growing_buffer():
+    growing_buffer = GrowingBuffer(np.int32, capacity=2)
+    growing_buffer.extend(np.arange(5))
+    growing_buffer.append(5)
+    view = growing_buffer.view()
+    assert list(view) == list(range(6)) and view.dtype == np.int32
+    growing_buffer.drop(4)
+    assert list(growing_buffer.view()) == [4, 5]
+    assert growing_buffer.searchsorted(5) == 1
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from pglive.sources.range_index import RangeExtremaIndex
+from pglive.sources.rolling_extrema import RollingExtrema
+
+
+def brute_force(values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0 or np.all(np.isnan(values)):
+        return np.nan, np.nan
+    return np.nanmin(values), np.nanmax(values)
+
+
+def assert_bounds(bounds, expected):
+    np.testing.assert_array_equal(np.asarray(bounds, dtype=np.float64), expected)
+
+
+def random_chunks(seed, count=200):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        chunk = rng.normal(size=int(rng.integers(1, 20)))
+        chunk[rng.random(chunk.size) < 0.1] = np.nan
+        yield chunk
+
+
+@pytest.mark.parametrize("window", [None, 1, 7, 64])
+def test_rolling_extrema_matches_brute_force(window):
+    extrema = RollingExtrema(window)
+    values = []
+    for chunk in random_chunks(window or 0):
+        extrema.extend(chunk)
+        values.extend(chunk)
+        assert_bounds(extrema.bounds(), brute_force(values[-window if window else 0:]))
+
+
+def test_rolling_extrema_drop_and_integers():
+    extrema = RollingExtrema()
+    extrema.extend(np.array([-32768, 5, 3, 32767], dtype=np.int16))
+    assert extrema.bounds() == (-32768, 32767)
+    extrema.drop(1)
+    assert extrema.bounds() == (3, 32767)
+    extrema.drop(10)
+    assert_bounds(extrema.bounds(), (np.nan, np.nan))
+
+
+@pytest.mark.parametrize("window", [None, 16, 100])
+def test_range_index_matches_brute_force(window):
+    rng = np.random.default_rng(1)
+    index = RangeExtremaIndex(window)
+    values = []
+    for chunk in random_chunks(2, 100):
+        index.extend(chunk)
+        values.extend(chunk)
+        first = index.first
+        for _ in range(5):
+            start, stop = sorted(rng.integers(0, len(values) + 1, 2))
+            assert_bounds(index.bounds(start, stop), brute_force(values[max(start, first):stop]))
+    # Dropped values are no longer queried
+    index.drop(10)
+    assert_bounds(index.bounds(0, len(values)), brute_force(values[index.first:]))
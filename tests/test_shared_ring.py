@@ -0,0 +1,76 @@
+import numpy as np
+
+from pglive.sources.shared_ring import _WRITING, SharedRingConsumer, SharedRingProducer
+
+
+class Connector:
+    def __init__(self):
+        self.y, self.x = [], []
+
+    def cb_append_data_array(self, y, x):
+        self.y.extend(y)
+        self.x.extend(x)
+
+
+def produce(producer, count):
+    x = np.arange(producer.writing, producer.writing + count, dtype=np.float64)
+    producer.extend(-x, x)
+
+
+def test_consumer_drops_samples_overwritten_while_copied():
+    producer = SharedRingProducer(capacity=100)
+    connector = Connector()
+    consumer = SharedRingConsumer(producer.name, connector, poll_rate=None)
+    try:
+        produce(producer, 80)
+        read = consumer._read
+
+        def overrun(start, stop):
+            # Producer wraps the ring between reading the counter and copying the samples
+            produce(producer, 150)
+            return read(start, stop)
+
+        consumer._read = overrun
+        assert consumer.poll() == 0
+        assert consumer.dropped_samples == 80
+        consumer._read = read
+        assert consumer.poll() == 100
+        assert consumer.dropped_samples == 130
+        assert connector.x == list(range(130, 230))
+        assert connector.y == [-x for x in connector.x]
+    finally:
+        consumer.close()
+        producer.unlink()
+
+
+def test_consumer_drops_samples_of_write_in_progress():
+    producer = SharedRingProducer(capacity=100)
+    connector = Connector()
+    consumer = SharedRingConsumer(producer.name, connector, poll_rate=None)
+    try:
+        produce(producer, 100)
+        # Write of 30 samples is announced, but not published yet
+        producer.header[_WRITING] = 130
+        producer.y[:30] = 0
+        assert consumer.poll() == 70
+        assert connector.x == list(range(30, 100))
+        assert consumer.dropped_samples == 30
+    finally:
+        consumer.close()
+        producer.unlink()
+
+
+def test_consumer_behind_more_than_capacity():
+    producer = SharedRingProducer(capacity=100, dtype=np.int16, x_dtype=np.float64)
+    connector = Connector()
+    consumer = SharedRingConsumer(producer.name, connector, poll_rate=None)
+    try:
+        for _ in range(5):
+            produce(producer, 70)
+        assert consumer.poll() == 100
+        assert consumer.dropped_samples == 250
+        assert connector.x == list(range(250, 350))
+        assert connector.y == [-x for x in connector.x]
+    finally:
+        consumer.close()
+        producer.unlink()
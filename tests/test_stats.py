@@ -0,0 +1,15 @@
+def test_connector_stats_after_reset(qapp, make_connector):
+    data_connector = make_connector(max_points=100, collect_stats=True)
+    plot_widget = data_connector.plot.plot_widget
+    plot_widget.show()
+    snapshots = []
+    for interval in range(3):
+        for value in range(10):
+            data_connector.cb_append_data_point(value + interval)
+            qapp.processEvents()
+            plot_widget.repaint()
+        snapshots.append(data_connector.stats.snapshot())
+        data_connector.stats.reset()
+    # Paint and range are timed in every interval, range is timed without stats of LivePlotWidget
+    assert all(snapshot.paint.calls > 0 for snapshot in snapshots)
+    assert all(snapshot.range.calls > 0 for snapshot in snapshots)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from pglive.sources.streaming_quantile import QuantileSketch, QuantileRange
+
+
+def exact(values, *quantiles):
+    return np.quantile(values, quantiles, method="nearest")
+
+
+@pytest.mark.parametrize("values", [
+    np.random.default_rng(0).uniform(1000, 1001, 1000),
+    np.random.default_rng(1).uniform(1e9, 1e9 + 1e-3, 1000),
+])
+def test_offset_data(values):
+    sketch = QuantileSketch()
+    sketch.extend(values)
+    low, high = sketch.quantiles(0.001, 0.999)
+    expected_low, expected_high = exact(values, 0.001, 0.999)
+    width = np.ptp(values)
+    assert low < high
+    assert abs(low - expected_low) < 0.01 * width
+    assert abs(high - expected_high) < 0.01 * width
+
+
+def test_tiny_amplitude_data():
+    values = np.random.default_rng(2).normal(0, 1e-12, 1000)
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(float(value))
+    low, high = sketch.quantiles(0.001, 0.999)
+    expected_low, expected_high = exact(values, 0.001, 0.999)
+    assert low < 0 < high
+    assert abs(low - expected_low) < 1e-14
+    assert abs(high - expected_high) < 1e-14
+
+
+def test_outliers_are_ignored():
+    values = np.random.default_rng(3).normal(5, 2, 1_000_000)
+    values[::100_000] = 1e9
+    values[5::100_000] = -1e9
+    sketch = QuantileSketch()
+    for chunk in np.split(values, 1000):
+        sketch.extend(chunk)
+    low, high = sketch.quantiles(0.001, 0.999)
+    expected_low, expected_high = exact(values, 0.001, 0.999)
+    assert abs(low - expected_low) < 0.05
+    assert abs(high - expected_high) < 0.05
+
+
+def test_constant_and_empty():
+    sketch = QuantileSketch()
+    assert all(np.isnan(sketch.quantiles(0.1, 0.9)))
+    sketch.extend(np.full(100, 3.))
+    assert sketch.quantiles(0.001, 0.999) == (3., 3.)
+
+
+def test_window_forgets_old_values():
+    quantile_range = QuantileRange(0.01, 0.99, window=1000)
+    quantile_range.extend(np.full(5000, 1e6))
+    quantile_range.extend(np.random.default_rng(4).uniform(1000, 1001, 1000))
+    low, high = quantile_range.bounds()
+    assert 1000 <= low < high <= 1001
+
+
+def test_offset_data_y_range(qapp, make_connector):
+    from pglive.sources.live_axis_range import LiveAxisRange
+    from pglive.sources.live_plot_widget import LivePlotWidget
+
+    plot_widget = LivePlotWidget(y_range_controller=LiveAxisRange(quantile_range=True))
+    data_connector = make_connector(plot_widget=plot_widget, max_points=1000, ring_buffer=True,
+                                    quantiles=(0.001, 0.999))
+    values = np.random.default_rng(5).uniform(1000, 1001, 1000)
+    for value in values:
+        data_connector.cb_append_data_point(value)
+    qapp.processEvents()
+    y_min, y_max = plot_widget.y_range_controller.final_y_range
+    assert y_min <= np.quantile(values, 0.01) and y_max >= np.quantile(values, 0.99)
+    assert y_max - y_min < 2
+
+
+def test_max_age_is_rejected():
+    from pglive.sources.data_connector import DataConnector
+    from pglive.sources.live_plot import LiveLinePlot
+
+    with pytest.raises(ValueError):
+        DataConnector(LiveLinePlot(), max_points=1000, ring_buffer=True, quantiles=(0.001, 0.999), max_age=100)
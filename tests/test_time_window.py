@@ -0,0 +1,56 @@
+import pytest
+
+from pglive.sources.live_axis_range import LiveAxisRange
+from pglive.sources.live_candleStickPlot import LiveCandleStickPlot
+from pglive.sources.live_plot import LiveLinePlot, LiveVBarPlot
+from pglive.sources.live_plot_widget import LivePlotWidget
+
+
+@pytest.fixture
+def plot_data(qapp, make_connector):
+    def plot(plot, x_range_controller, **kwargs):
+        plot_widget = LivePlotWidget(x_range_controller=x_range_controller)
+        data_connector = make_connector(plot, plot_widget, max_points=1000, **kwargs)
+        # Old peak outside of time window
+        for i in range(100):
+            data_connector.cb_append_data_point(100. if i == 0 else float(i % 7), i * 0.5)
+            qapp.processEvents()
+        return plot_widget
+
+    return plot
+
+
+@pytest.mark.parametrize("plot_type", [LiveLinePlot, LiveVBarPlot])
+@pytest.mark.parametrize("kwargs", [{}, {"ring_buffer": True, "range_index": True}])
+def test_y_range_fits_time_window(plot_data, plot_type, kwargs):
+    plot_widget = plot_data(plot_type(), LiveAxisRange(time_window=10.), **kwargs)
+    assert plot_widget.x_range_controller.final_x_range == [39.5, 49.5]
+    assert plot_widget.y_range_controller.final_y_range[1] < 100
+
+
+def test_offsets_extend_time_window(plot_data):
+    plot_widget = plot_data(LiveLinePlot(), LiveAxisRange(time_window=10., offset_left=1., offset_right=2.))
+    assert plot_widget.x_range_controller.final_x_range == [38.5, 51.5]
+
+
+def test_fixed_range_takes_precedence(plot_data):
+    plot_widget = plot_data(LiveLinePlot(), LiveAxisRange(time_window=10., fixed_range=[0., 5.]))
+    assert plot_widget.x_range_controller.final_x_range == [0., 5.]
+
+
+def test_crop_to_time_window(plot_data):
+    plot = LiveLinePlot()
+    plot_widget = plot_data(plot, LiveAxisRange(time_window=10., crop_to_time_window=True), ring_buffer=True)
+    assert plot_widget.x_range_controller.final_x_range == [39.5, 49.5]
+    assert plot.xData[0] == 39.5 and len(plot.xData) == 21
+
+
+def test_candle_stick_y_range_fits_time_window(qapp, make_connector):
+    plot_widget = LivePlotWidget(x_range_controller=LiveAxisRange(time_window=10.))
+    data_connector = make_connector(LiveCandleStickPlot(), plot_widget, max_points=1000)
+    for i in range(100):
+        # Old peak outside of time window
+        high = 100. if i == 0 else 2.
+        data_connector.cb_append_data_point([1., 1.5, 0., high], float(i))
+        qapp.processEvents()
+    assert plot_widget.y_range_controller.final_y_range[1] < 100